@@ -1,15 +1,85 @@
+from __future__ import annotations
+
 from io import TextIOWrapper
 from math import floor
+import mmap
 import numpy as np
 import os
 from tqdm import tqdm
-from bidict import bidict
 
 # Gdata version
 version = 'master'
 
+# marker of a normally terminated Gaussian calculation
+_NORMAL_TERMINATION = b'Normal termination of Gaussian'
+# number of bytes read from the end of a log file for validation
+_LOG_TAIL_SIZE = 4096
+
+# markers of data blocks in Gaussian log files
+_STRUCTURE_MARKER = b'Standard orientation:'
+_STRUCTURE_END = b'-----'
+_MULLIKEN_MARKERS = (b'Mulliken charges:', b'Mulliken charges and spin densities:')
+_MULLIKEN_END = b'Sum of Mulliken charges'
+_HIRSHFELD_MARKER = b'Hirshfeld charges, spin densities, dipoles, and CM5 charges'
+_HIRSHFELD_END = b'Tot'
+_DIPOLE_MARKER = b'Dipole moment (field-independent basis, Debye):'
+
+# name prefix of parsed directory cache files, e.g. .gdata_cache_mol2.npz
+_DIR_CACHE_PREFIX = '.gdata_cache_'
+# directories with fewer files are read serially, pool start-up would dominate
+_MIN_PARALLEL_FILES = 8
+
+# atomic symbol to atomic number
+_SYM2Z = {
+    'Ghost': 0,
+    'H': 1,
+    'C': 6,
+    'N': 7,
+    'O': 8,
+    'F': 9,
+    'P': 15,
+    'S': 16,
+    'Cl': 17
+}
+# atomic number to atomic symbol, indexed by atomic number, '' for unsupported
+_Z2SYM = np.array(['Ghost', 'H', '', '', '', '', 'C', 'N', 'O', 'F',
+                   '', '', '', '', '', 'P', 'S', 'Cl'], dtype=object)
+# supported atomic numbers, Ghost (0) included
+_SUPPORTED_Z = _Z2SYM != ''
+# atomic mass, indexed by atomic number
+_ATOMIC_MASS = np.array([0, 1.0080, 0, 0, 0, 0, 12.011, 14.007, 15.999, 18.998,
+                         0, 0, 0, 0, 0, 30.974, 32.06, 35.45])
+# mol2 bond type to topology value, unknown types are 0
+_BOND_TYPE = {
+    '1': 1,
+    '2': 2,
+    '3': 3,
+    'am': 4,
+    'ar': 5,
+    'du': 6
+}
+
+
+def _atomic_numbers(sym: int | float | np.ndarray) -> np.ndarray:
+    """
+    Validate atomic numbers, raise KeyError if any of them is not integral or not a supported element
 
-def element_dic(sym) -> str or int:
+    Args:
+        sym: atomic number, single or array. type <int>, <float> or <numpy.ndarray>
+    Returns:
+        atomic_number: type <numpy.ndarray>
+    """
+    sym = np.asarray(sym)
+    # nan and inf are caught by the comparison below
+    with np.errstate(invalid='ignore'):
+        atomic_number = sym.astype(int)
+    valid = (atomic_number == sym) & (atomic_number >= 0) & (atomic_number < len(_Z2SYM))
+    valid &= _SUPPORTED_Z[np.where(valid, atomic_number, 0)]
+    if not valid.all():
+        raise KeyError(sym[~valid].flat[0].item())
+    return atomic_number
+
+def element_dic(sym: str | int | float) -> str | int:
     """
     Two way dictionary for atomic number and symbol
 
@@ -21,53 +91,37 @@ def element_dic(sym) -> str or int:
         atomic_number.inverse: if input is a number, return atomic 
                                symbol. type <str>
     """
-    atomic_number = bidict({
-        'Ghost': 0,
-        'H': 1,
-        'C': 6,
-        'N': 7,
-        'O': 8,
-        'F': 9,
-        'P': 15,
-        'S': 16,
-        'Cl': 17
-    })
-    if type(sym) == str:
-        return atomic_number[sym]
-    else:
-        return atomic_number.inverse[sym]
+    if isinstance(sym, str):
+        return _SYM2Z[sym]
+    return _Z2SYM[int(_atomic_numbers(sym))]
 
-def atom_mass_dict(sym) -> float:
+def element_array(symbols: list | np.ndarray) -> np.ndarray:
+    """
+    Convert a sequence of atomic symbols to atomic numbers
+
+    Args:
+        symbols: atomic symbols. type <list> or <numpy.ndarray>
+    Returns:
+        atomic_numbers: type <numpy.ndarray>
+    """
+    return np.fromiter((_SYM2Z[s] for s in symbols), dtype=np.int8, count=len(symbols))
+
+def atom_mass_dict(sym: str | int | float | np.ndarray) -> float | np.ndarray:
     """
     One way dictionary from atom type to atomic mass
 
     Args:
-        sym: atomic number or symbol. type <int>, <float> or <str>
+        sym: atomic number or symbol, single or array. type <int>, <float>, <str> or <numpy.ndarray>
     Returns:
-        atomic weight: type <float>
+        atomic weight: type <float> or <numpy.ndarray>
     """
-    a_mass = {
-        'Ghost': 0,
-        'H': 1.0080,
-        'C': 12.011,
-        'N': 14.007,
-        'O': 15.999,
-        'F': 18.998,
-        'P': 30.974,
-        'S': 32.06,
-        'Cl': 35.45
-    }
-
-    if sym is not np.ndarray:
-        sym = np.array(sym)
-
-    atom_weight = np.zeros(1)
-
-    for s in sym:
-        if s is not str:
-            s = element_dic(s)
-        atom_weight = np.append(atom_weight, a_mass[s])
-    return atom_weight[1:]
+    sym = np.asarray(sym)
+    if sym.dtype.kind in 'OUS':
+        # convert symbols to atomic numbers
+        atomic_number = np.vectorize(_SYM2Z.__getitem__, otypes=[int])(sym)
+    else:
+        atomic_number = _atomic_numbers(sym)
+    return _ATOMIC_MASS[atomic_number]
 
 def vec_normalise(vec: np.ndarray) -> np.ndarray:
     """
@@ -83,22 +137,355 @@ def vec_normalise(vec: np.ndarray) -> np.ndarray:
         return vec
     return vec / norm
 
-def bond_dic(sym):
+def bond_dic(sym: str) -> int:
+    return _BOND_TYPE.get(sym, 0)
+
+def fill_topology(topology: np.ndarray, atom_1: list | np.ndarray, atom_2: list | np.ndarray, bond: list | np.ndarray):
+    """
+    Write symmetric bond information into topology matrix in place
+
+    Args:
+        topology: topology matrix in shape [max_atom, max_atom]. type <numpy.ndarray>
+        atom_1: index of first atoms in bonds. type <list> or <numpy.ndarray>
+        atom_2: index of second atoms in bonds. type <list> or <numpy.ndarray>
+        bond: bond type of each bond. type <list> or <numpy.ndarray>
+    Returns:
+        None
+    """
+    atom_1 = np.asarray(atom_1, dtype=int)
+    atom_2 = np.asarray(atom_2, dtype=int)
+    bond = np.asarray(bond, dtype=topology.dtype)
+    topology[atom_1, atom_2] = bond
+    topology[atom_2, atom_1] = bond
+
+def parse_mol(file_content: list) -> tuple:
+    """
+    Parse content of .mol file
+
+    Args:
+        file_content: lines of .mol file. type <list>
+    Returns:
+        structure: structral coordinates in shape [atom_num, 4]. type <numpy.ndarray>
+        topology: topological information in shape [atom_num, atom_num]. type <numpy.ndarray>
+    """
+    # read atom number
+    atom_num = int(file_content[3].split()[0])
+
+    # read structure coordinate
+    # example of line: x, y, z, symbol, ...
+    atom_lines = [line.split() for line in file_content[4:4+atom_num]]
+    structure = np.zeros((atom_num, 4), dtype=np.float32)
+    structure[:, 0] = element_array([line[3] for line in atom_lines])
+    structure[:, 1:] = np.array([line[:3] for line in atom_lines], dtype=np.float32).reshape(-1, 3)
+
+    # read topological information
+    topology = np.zeros((atom_num, atom_num), dtype=np.int8)
+    topo_start = 4 + atom_num
+    topo_end = len(file_content) - 1
+
+    # only first three columns (atom 1, atom 2, bond order) are used
+    bond_info = np.array(
+        [line.split()[:3] for line in file_content[topo_start:topo_end]],
+        dtype=int).reshape(-1, 3)
+    fill_topology(topology, bond_info[:, 0] - 1,
+                  bond_info[:, 1] - 1, bond_info[:, 2])
+
+    return structure, topology
+
+def parse_mol2(file_content: list) -> tuple:
+    """
+    Parse content of .mol2 file
+
+    Args:
+        file_content: lines of .mol2 file. type <list>
+    Returns:
+        structure: structral coordinates in shape [atom_num, 4]. type <numpy.ndarray>
+        topology: topological information in shape [atom_num, atom_num]. type <numpy.ndarray>
+    """
+    # read general info
+    for line_no in range(len(file_content)):
+        line_temp = file_content[line_no]
+        if line_temp.find('@<TRIPOS>MOLECULE') != -1:
+            stat_line = file_content[line_no+2]
+            atom_num = int(stat_line.split()[0])
+            bond_num = int(stat_line.split()[1])
+        elif line_temp.find('@<TRIPOS>ATOM') != -1:
+            atom_start = line_no + 1
+        elif line_temp.find('@<TRIPOS>BOND') != -1:
+            bond_start = line_no + 1
+
+    # read structure info
+    # example of line: id, name, x, y, z, symbol.type, ...
+    atom_lines = [line.split() for line in file_content[atom_start:atom_start+atom_num]]
+    structure = np.zeros((atom_num, 4), dtype=np.float32)
+    structure[:, 0] = element_array([line[5].split('.')[0] for line in atom_lines])
+    structure[:, 1:] = np.array([line[2:5] for line in atom_lines], dtype=np.float32).reshape(-1, 3)
+
+    # read topological info
+    topology = np.zeros((atom_num, atom_num), dtype=np.int8)
+    bond_lines = [line.split() for line in file_content[bond_start:bond_start+bond_num]]
+    fill_topology(topology,
+                  [int(line[1]) - 1 for line in bond_lines],
+                  [int(line[2]) - 1 for line in bond_lines],
+                  [bond_dic(line[3]) for line in bond_lines])
+
+    return structure, topology
+
+def read_topo_file(file_name: str, file_type: str) -> tuple | None:
+    """
+    Read structure and topology from a .mol or .mol2 file, used by directory readers
+
+    Args:
+        file_name: file path and name to be read. type <str>
+        file_type: 'mol' or 'mol2'. type <str>
+    Returns:
+        structure and topology from parser, None if file failed to open or read. type <tuple>
+    """
+    parser = parse_mol2 if file_type == 'mol2' else parse_mol
+    try:
+        with open(file_name, 'r') as file:
+            return parser(file.readlines())
+    except:
+        return None
+
+def val_log(log_map: mmap.mmap) -> bool:
+    """
+    Validate Gaussian log file if it was exit normally
+
+    Args:
+        log_map: mapped log file for validation. type <mmap.mmap>
+    Returns:
+        validation_result: True for passed. type <bool>
+    """
+
+    # only last line is checked, take tail of mapped file
+    tail_lines = log_map[max(0, len(log_map) - _LOG_TAIL_SIZE):].splitlines()
+    if len(tail_lines) == 0:
+        return False
+    find_result = tail_lines[-1].find(_NORMAL_TERMINATION)
+    if find_result == -1:
+        return False
+    else:
+        return True
+
+def _log_block(log_map: mmap.mmap, loc: int, skip: int, end_marker: bytes, line_num=None) -> list:
+    """
+    Take lines of a data block from mapped log file
+
+    Args:
+        log_map: mapped log file. type <mmap.mmap>
+        loc: byte offset inside the title line of block. type <int>
+        skip: number of lines to skip from title line. type <int>
+        end_marker: block stops before the line containing this marker. type <bytes>
+        line_num: take fixed number of lines instead of searching end_marker. type <int>
+    Returns:
+        block_lines: lines of data block. type <list>
+    """
+    # move to start of first data line
+    start = log_map.rfind(b'\n', 0, loc) + 1
+    for _ in range(skip):
+        start = log_map.find(b'\n', start) + 1
+        if start == 0:
+            raise ValueError('Unexpected end of log file!')
+
+    if line_num is not None:
+        end = start
+        for _ in range(line_num):
+            end = log_map.find(b'\n', end) + 1
+            if end == 0:
+                end = len(log_map)
+                break
+    else:
+        # stop at start of line containing end marker
+        end = log_map.find(end_marker, start)
+        if end == -1:
+            end = len(log_map)
+        else:
+            end = log_map.rfind(b'\n', start, end) + 1
+            if end == 0:
+                end = start
+    return log_map[start:end].splitlines()
+
+def parse_log(log_map: mmap.mmap, charge_type: str, max_atom: int) -> tuple:
+    """
+    Read coordinate and charge from Gaussian output log file
+
+    Args:
+        log_map: mapped log file to read. type <mmap.mmap>
+        charge_type: 'Mulliken' or 'Hirshfeld'. type <str>
+        max_atom: number of atom rows in returned arrays. type <int>
+    Returns:
+        structure: coordinate strcture in log file. type <numpy.ndarray>
+        charge: charge information in log file. type <numpy.ndarray>
+        dipole_moment: dipole moment in log file. type <float>
+    """
+
+    # file is searched from the end for the last result
+    # find coordinate and charge location in file
+    structure_loc = log_map.rfind(_STRUCTURE_MARKER)
+    Mcharge_loc = max([log_map.rfind(marker) for marker in _MULLIKEN_MARKERS])
+    dipole_loc = log_map.rfind(_DIPOLE_MARKER)
+    Hcharge_loc = log_map.rfind(_HIRSHFELD_MARKER)
+
+    # read coordinate
+    if structure_loc == -1:
+        raise ValueError('No structure founded here!')
+    # skip extra 5 lines
+    structure_lines = _log_block(log_map, structure_loc, 5, _STRUCTURE_END)
+    # whole block is numeric, parse at once into rows of 6 columns
+    structure_block = np.array(
+        b' '.join(structure_lines).split(), dtype=np.float32).reshape(-1, 6)
+    # rest space stays zero
+    structure_temp = np.zeros((max_atom, 4), dtype=np.float32)
+    # keep atomic number and xyz, skip center number and atomic type
+    structure_temp[:structure_block.shape[0]] = structure_block[:, [1, 3, 4, 5]]
+
+    # read mulliken charge
+    if charge_type == 'Mulliken':
+        if Mcharge_loc == -1:
+            raise ValueError('No Mulliken charge founded here!')
+        # skip extra 2 lines
+        charge_lines = _log_block(
+            log_map, Mcharge_loc, 2, _MULLIKEN_END)
+        # only charge column is needed, atom index and symbol are skipped
+        charge_temp = np.zeros(max_atom, dtype=np.float32)  # rest space stays zero
+        charge_temp[:len(charge_lines)] = np.array(
+            b' '.join(charge_lines).split()).reshape(len(charge_lines), -1)[:, 2]
+
+    # read hirshfeld charge
+    elif charge_type == 'Hirshfeld':
+        if Hcharge_loc == -1:
+            raise ValueError('No Hirshfeld charge founded here!')
+        charge_lines = _log_block(log_map, Hcharge_loc, 2, _HIRSHFELD_END)
+        # only charge column is needed, atom index and symbol are skipped
+        charge_temp = np.zeros(max_atom, dtype=np.float32)  # rest space stays zero
+        charge_temp[:len(charge_lines)] = np.array(
+            b' '.join(charge_lines).split()).reshape(len(charge_lines), -1)[:, 2]
+
+    # read dipole moment
+    if dipole_loc == -1:
+        raise ValueError('No dipole moment founded here!')
+    line_temp = _log_block(log_map, dipole_loc, 1, None, 1)[0]
+    line_temp = line_temp.split()
+    dipole_temp = []
+    dipole_temp.append(float(line_temp[1]))
+    dipole_temp.append(float(line_temp[3]))
+    dipole_temp.append(float(line_temp[5]))
+    dipole_temp = np.array(dipole_temp, dtype=np.float32)
+
+    return structure_temp, charge_temp, dipole_temp
+
+def read_log(file_name: str, charge_type: str, max_atom: int, validation=True) -> tuple:
+    """
+    Validate and read a Gaussian log file without raising, used by directory reader
+
+    Args:
+        file_name: path and name of Gaussian log file. type <str>
+        charge_type: 'Mulliken' or 'Hirshfeld'. type <str>
+        max_atom: number of atom rows in returned arrays. type <int>
+        validation: check whether the Gaussian calculation exit normally. type <bool>
+    Returns:
+        status: 'ok', 'io' for failed opening, 'invalid' for failed validation
+                or 'content' for failed reading. type <str>
+        data: structure, charge and dipole moment from parser, None if failed. type <tuple>
+    """
     try:
-        bd = {
-            '1': 1,
-            '2': 2,
-            '3': 3,
-            'am': 4,
-            'ar': 5,
-            'du': 6
-        }
-        return bd[sym]
+        file = open(file_name, 'rb')
     except:
-        return 0
+        return 'io', None
+    # map file once, validation and reading share the same map
+    with file:
+        try:
+            log_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except:
+            return 'content', None
+        with log_map:
+            if validation == True and val_log(log_map) == False:
+                return 'invalid', None
+            try:
+                return 'ok', parse_log(log_map, charge_type, max_atom)
+            except:
+                return 'content', None
+
+class _GrowArray():
+    """
+    Array storage with amortised growth along first axis, only the first size rows hold data
+    """
+
+    __slots__ = ('buffer', 'size')
+
+    def __init__(self, array: np.ndarray):
+        self.assign(array)
+
+    def assign(self, array: np.ndarray):
+        """
+        Replace stored data, buffer is taken as it is
+        """
+        self.buffer = np.asarray(array)
+        self.size = self.buffer.shape[0]
+
+    def view(self) -> np.ndarray:
+        """
+        Output stored data as a view of buffer
+        """
+        return self.buffer[:self.size]
+
+    def extend(self, array: np.ndarray):
+        """
+        Append rows to stored data, buffer capacity is doubled when it is full
+        """
+        array = np.asarray(array)
+        if array.shape[1:] != self.buffer.shape[1:]:
+            raise ValueError('shape %s can not be appended to data in shape %s'
+                             % (array.shape, self.view().shape))
+
+        # strings are widened to fit, numbers are cast to stored dtype
+        dtype = self.buffer.dtype
+        if dtype.kind in 'USO':
+            dtype = np.result_type(dtype, array.dtype)
+
+        new_size = self.size + array.shape[0]
+        if new_size > self.buffer.shape[0] or dtype != self.buffer.dtype:
+            capacity = max(2 * self.buffer.shape[0], new_size)
+            new_buffer = np.zeros((capacity,) + self.buffer.shape[1:], dtype=dtype)
+            new_buffer[:self.size] = self.view()
+            self.buffer = new_buffer
+        self.buffer[self.size:new_size] = array
+        self.size = new_size
+
+
+def _grow_property(slot: str) -> property:
+    """
+    Expose a _GrowArray slot of Gdata as a plain array attribute
+    """
+    def getter(self):
+        return getattr(self, slot).view()
+
+    def setter(self, array):
+        getattr(self, slot).assign(array)
+
+    return property(getter, setter)
+
 
 class Gdata():
 
+    # fixed attribute set, no per-instance __dict__
+    __slots__ = ('max_atom',
+                 'charge_type',
+                 'mi_coor',
+                 '_structures',
+                 '_charges',
+                 '_names',
+                 '_topologies',
+                 '_dipoles')
+
+    # stored data, appended through add_data() with amortised growth
+    structures = _grow_property('_structures')
+    charges = _grow_property('_charges')
+    names = _grow_property('_names')
+    topologies = _grow_property('_topologies')
+    dipoles = _grow_property('_dipoles')
+
     def __init__(self, charge_type='Mulliken', max_atom=100):
         """
         Initialise Gdata class.
@@ -113,12 +500,12 @@ class Gdata():
         self.charge_type = charge_type
         self.mi_coor = False
 
-        self.structures = np.zeros((1, self.max_atom, 4), dtype=float)
-        self.charges = np.zeros((1, self.max_atom), dtype=float)
-        self.names = np.zeros(1, dtype=str)
-        self.topologies = np.zeros(
-            (1, self.max_atom, self.max_atom), dtype=int)
-        self.dipoles = np.zeros((1, 3), dtype=float)
+        self._structures = _GrowArray(np.zeros((0, self.max_atom, 4), dtype=np.float32))
+        self._charges = _GrowArray(np.zeros((0, self.max_atom), dtype=np.float32))
+        self._names = _GrowArray(np.zeros(0, dtype=str))
+        self._topologies = _GrowArray(np.zeros(
+            (0, self.max_atom, self.max_atom), dtype=np.int8))
+        self._dipoles = _GrowArray(np.zeros((0, 3), dtype=np.float32))
 
     """ PRIVATE """
 
@@ -144,86 +531,49 @@ class Gdata():
         data_num = []
         max_atom_list = []
 
-        # check structure: ideal shape should be [x, max_atom, 4]
-        if structures is not None:
-            # save data number for later
-            data_num.append(structures.shape[0])
-            # check number of dimension:
-            if np.ndim(structures) is not 3:
-                print('Gdata: number of dimension of structure info is not correct!')
-                print('Gdata: expect to be 3, but %d detected' % (np.ndim(structures)))
-                return False
-            # save max_atom for later
-            max_atom_list.append(structures.shape[1])
-            # check length in dimension 2
-            if structures.shape[2] is not 4:
-                print('Gdata: data shape of structure info in dimension 2 in not correct!')
-                print('Gdata: expect to be 4, but %d detected' % (structures.shape[2]))
-                return False
-
-        # check charge: ideal shape should be [x, max_atom]
-        if charges is not None:
-            # save data number for later:
-            data_num.append(charges.shape[0])
-            # check number of dimension:
-            if np.ndim(charges) is not 2:
-                print('Gdata: number of dimension of charge info is not correct!')
-                print('Gdata: expect to be 2, but %d detected' % (np.ndim(charges)))
-                return False
-            # save max_atom for later
-            max_atom_list.append(charges.shape[1])
-        
-        # check name: ideal shape should be [x]
-        if names is not None:
-            # save data number for later:
-            data_num.append(names.shape[0])
-            # check number of dimension:
-            if np.ndim(names) is not 1:
-                print('Gdata: number of dimension of name info is not correct!')
-                print('Gdata: expect to be 1, but %d detected' % (np.ndim(names)))
+        # expected shape of each data, None for free length
+        #   structure: [x, max_atom, 4]
+        #   charge: [x, max_atom]
+        #   name: [x]
+        #   topology: [x, max_atom, max_atom]
+        #   dipole: [x, 3]
+        data_specs = ((structures, 'structure', (None, 'max_atom', 4)),
+                      (charges, 'charge', (None, 'max_atom')),
+                      (names, 'name', (None,)),
+                      (topologies, 'topology', (None, 'max_atom', 'max_atom')),
+                      (dipoles, 'dipole', (None, 3)))
+
+        for data, data_type, shape in data_specs:
+            if data is None:
+                continue
+            # check number of dimension
+            if np.ndim(data) != len(shape):
+                print('Gdata: number of dimension of %s info is not correct!' % (data_type))
+                print('Gdata: expect to be %d, but %d detected' % (len(shape), np.ndim(data)))
                 return False
-        
-        # check topo info: ideal shape should be [x, max_atom, max_atom]
-        if topologies is not None:
             # save data number for later
-            data_num.append(topologies.shape[0])
-            # check number of dimension:
-            if np.ndim(topologies) is not 3:
-                print('Gdata: number of dimension of topology info is not correct!')
-                print('Gdata: expect to be 3, but %d detected' % (np.ndim(topologies)))
-                return False
-            # check shape consistency of dimension 1 and dimension 2
-            if topologies.shape[1] != topologies.shape[2]:
-                print('Gdata: data inconsistency found in topology info!')
-                print('Gdata: shape in dimension 1 and 2 are expected to be the same, but now it is %d in dimension 1 and %d in dimension 2' % (topologies.shape[1], topologies.shape[2]))
-                return False
-            # save max_atom for later
-            max_atom_list.append(topologies.shape[1])
+            data_num.append(data.shape[0])
+            for dim in range(1, len(shape)):
+                if shape[dim] == 'max_atom':
+                    # save max_atom for later
+                    max_atom_list.append(data.shape[dim])
+                elif data.shape[dim] != shape[dim]:
+                    print('Gdata: data shape of %s info in dimension %d in not correct!' % (data_type, dim))
+                    print('Gdata: expect to be %d, but %d detected' % (shape[dim], data.shape[dim]))
+                    return False
+
+        # empty data sets do not take part in data number check
+        data_num = [num for num in data_num if num != 0]
 
-        # check dipole info: ideal shape should be [x, 3]
-        if dipoles is not None:
-            # save data number for later
-            data_num.append(dipoles.shape[0])
-            # check number of dimension
-            if np.ndim(dipoles) is not 2:
-                print('Gdata: number of dimension of dipole info is not correct!')
-                print('Gdata: expect to be 2, but %d detected' % (np.ndim(dipoles)))
-                return False
-            # check shape in dimension 1
-            if dipoles.shape[1] is not 3:
-                print('Gdata: data shape of dipole info in dimension 1 in not correct!')
-                print('Gdata: expect to be 3, but %d detected' % (dipoles.shape[1]))
-                return False
-            
         # check max_atom consistency
-        if len(max_atom_list) is not 0:
+        if len(max_atom_list) != 0:
             if max_atom_list.count(max_atom_list[0]) != len(max_atom_list):
                 print('Gdata: data inconsistency found in max_atom!')
                 print("Gdata: auto check is not yet supported. please check data manually use get_data_shape() method!")
                 return False
         
         # check data_num consistency
-        if len(data_num) is not 0:
+        if len(data_num) != 0:
             if data_num.count(data_num[0]) != len(data_num):
                 print('Gdata: data inconsistency found in data number!')
                 print("Gdata: auto check is not yet supported. please check data manually use get_data_shape() method!")
@@ -231,7 +581,7 @@ class Gdata():
 
         return True
 
-    def __read_zmat(self, file: TextIOWrapper) -> np.ndarray:
+    def __read_zmat(self, file: TextIOWrapper) -> tuple:
         """
         read in .com file generate by Gaussian newzmat
 
@@ -270,62 +620,61 @@ class Gdata():
         # read in coordinate
         # example of line:
         #   C                                                -2.725769000000     -0.395935000000     -0.210123000000
-        coor_temp = np.zeros((1, 4), dtype=float)
-        for i in range(coordinate_start, coordinate_end):
-            line_temp = file_lines[i].split()
-            # convert element sym to num
-            line_temp[0] = element_dic(line_temp[0])
-            line_temp = np.array(line_temp, dtype=float)
-            coor_temp = np.append(coor_temp, [line_temp], axis=0)
-
-        coor_temp = coor_temp[1:]
-        coor_temp = np.pad(
-            coor_temp, ((0, self.max_atom-coor_temp.shape[0]), (0, 0)))
+        # whole block is split at once and reshaped to rows of [symbol, x, y, z]
+        coor_tokens = np.array(
+            ''.join(file_lines[coordinate_start:coordinate_end]).split()).reshape(-1, 4)
+        atom_num = coor_tokens.shape[0]
+        coor_temp = np.zeros((self.max_atom, 4), dtype=np.float32)
+        # convert element sym to num
+        coor_temp[:atom_num, 0] = element_array(coor_tokens[:, 0].tolist())
+        coor_temp[:atom_num, 1:] = coor_tokens[:, 1:].astype(np.float32)
 
         # read in topologies
         # example of line:
         #  1 2 1.000 8 1.000 9 1.000 10 1.000
         topologies_start = coordinate_end + 1
-        topo_temp = np.zeros((self.max_atom, self.max_atom), dtype=int)
+        topo_temp = np.zeros((self.max_atom, self.max_atom), dtype=np.int8)
+        atom1_list = []
+        atom2_list = []
+        bond_list = []
         for i in range(topologies_start, lines_num):
             line_temp = file_lines[i]
             if line_temp == ' \n':
                 break
             line_temp = line_temp.split()
             atom1 = int(line_temp[0]) - 1
-            topo_temp[atom1, atom1] = 0    # set self bond to 0
             for j in range(1, len(line_temp), 2):
-                atom2 = int(line_temp[j]) - 1
-                bonding = int(floor(float(line_temp[j+1])))
-                topo_temp[atom1, atom2] = bonding
-                topo_temp[atom2, atom1] = bonding
+                atom1_list.append(atom1)
+                atom2_list.append(int(line_temp[j]) - 1)
+                bond_list.append(int(floor(float(line_temp[j+1]))))
+        fill_topology(topo_temp, atom1_list, atom2_list, bond_list)
+        np.fill_diagonal(topo_temp, 0)    # set self bond to 0
         # move back pointer
         file.seek(position, 0)
         return coor_temp, topo_temp
 
     # write xyz file
-    def __write_xyz(self, file: TextIOWrapper, coordinate: np.ndarray) -> int:
+    def __format_xyz(self, coordinate: np.ndarray) -> tuple:
         """
-        write xyz coordinate to file and return actual number of atom in molecule
+        Format xyz coordinate lines and count actual number of atom in molecule
 
         Args:
-            file: file to write. type <_io.TextIOWrapper>
             coordinate: coordinate of structure in shape [max_atom, 4]. type <numpy.ndarray>
         Returns:
             atom_num: actual number of atom in this structure. type <int>
+            xyz_lines: formatted coordinate lines. type <str>
         """
 
-        # print lines
-        for i in range(self.max_atom):
-            # stop while meet padded zero
-            if coordinate[i][0] == 0:
-                atom_num = i
-                break
-            else:
-                # print elements
-                print('%s %f %f %f' % (element_dic(
-                    coordinate[i][0]), coordinate[i][1], coordinate[i][2], coordinate[i][3]), file=file)
-        return atom_num
+        # stop at first padded zero
+        padded = np.flatnonzero(coordinate[:, 0] == 0)
+        atom_num = int(padded[0]) if padded.size != 0 else coordinate.shape[0]
+
+        # format all lines at once, unsupported elements raise KeyError
+        symbols = _Z2SYM[_atomic_numbers(coordinate[:atom_num, 0])]
+        xyz = coordinate[:atom_num, 1:4].tolist()
+        xyz_lines = ''.join(['%s %f %f %f\n' % (sym, x, y, z)
+                             for sym, (x, y, z) in zip(symbols, xyz)])
+        return atom_num, xyz_lines
 
     # xyz reader
 
@@ -350,20 +699,16 @@ class Gdata():
         else:
             start_line = 0
 
-        # read XYZ coordinate
-        coor_temp = np.zeros((1, 4), dtype=float)
-        for i in range(start_line, len(file_lines)):  # skip first two lines
-            line_temp = file_lines[i].split()
-            # convert element sym to num
-            line_temp[0] = element_dic(line_temp[0])
-            line_temp = np.array(line_temp, dtype=float)
-            coor_temp = np.append(coor_temp, [line_temp], axis=0)
-
-        coor_temp = coor_temp[1:]
-        # print(coor_temp)
-        # pad rest space with zero
-        coor_temp = np.pad(
-            coor_temp, ((0, self.max_atom-coor_temp.shape[0]), (0, 0)))
+        # read XYZ coordinate, whole block is split at once and
+        # reshaped to rows of [symbol, x, y, z]
+        coor_tokens = np.array(''.join(file_lines[start_line:]).split()).reshape(-1, 4)
+        atom_num = coor_tokens.shape[0]
+
+        # write into zero padded array
+        coor_temp = np.zeros((self.max_atom, 4), dtype=np.float32)
+        # convert element sym to num
+        coor_temp[:atom_num, 0] = element_array(coor_tokens[:, 0].tolist())
+        coor_temp[:atom_num, 1:] = coor_tokens[:, 1:].astype(np.float32)
 
         file.seek(position, 0)
         return coor_temp
@@ -381,146 +726,34 @@ class Gdata():
         """
 
         # extract only file name (no dir and no file type)
-        file_name_start = 0
-        file_name_end = 0
-        for i in range(len(file_name)):
-            if file_name[i] == '/':
-                file_name_start = i
-            elif file_name[i] == '.':
-                file_name_end = i
-        if file_name_start >= file_name_end:
-            file_name_end = len(file_name)
-
-        # bug_fix: no skip if name has no path
-        if file_name_start != 0:
-            file_name_start = file_name_start + 1
-
-        # take file name
-        real_name = file_name[file_name_start:file_name_end]
+        real_name = os.path.splitext(os.path.basename(file_name))[0]
         return real_name
 
-    # data validation
-
-    def __val_log(self, file: TextIOWrapper) -> bool:
+    def __fit_topo_data(self, structure: np.ndarray, topology: np.ndarray) -> tuple:
         """
-        Validate Gaussian log file if it was exit normally
+        Pad parsed structure and topology to max_atom, max_atom is raised if needed
 
         Args:
-            file: opened file for validation. type <_io.TextIOWrapper>
-        Returns:
-            validation_result: True for passed. type <bool>
-        """
-
-        position = file.tell()  # note pointer position
-        file.seek(0, 0)  # move to start of file
-        file_lines = file.readlines()
-        lines_num = len(file_lines)
-        last_line = file_lines[lines_num-1]
-        find_result = last_line.find('Normal termination of Gaussian')
-        file.seek(position, 0)  # move pointer back to original position
-        if find_result == -1:
-            return False
-        else:
-            return True
-
-    # log reader
-
-    def __read_log(self, file: TextIOWrapper) -> np.ndarray:
+            structure: structral coordinates in shape [atom_num, 4]. type <np.ndarray>
+            topology: topological information in shape [atom_num, atom_num]. type <np.ndarray>
+        Return:
+            structure: structral coordinates in shape [1, max_atom, 4]. type <np.ndarray>
+            topology: topological information in shape [1, max_atom, max_atom]. type <np.ndarray>
         """
-        Read coordinate and charge from Gaussian output log file
+        atom_num = structure.shape[0]
+        if atom_num > self.max_atom:
+            print("Gdata: number of atoms read is larger than maximun allow atom!")
+            print("Gdata: auto change max_atom to %d." % (atom_num))
+            self.change_max_atom(atom_num)
 
-        Args:
-            file: opened log file to read. type <_io.TextIOWrapper>
-        Returns:
-            structure: coordinate strcture in log file. type <numpy.ndarray>
-            charge: charge information in log file. type <numpy.ndarray>
-            dipole_moment: dipole moment in log file. type <float>
-        """
+        # write into zero padded arrays
+        structure_out = np.zeros((1, self.max_atom, 4), dtype=np.float32)
+        topology_out = np.zeros((1, self.max_atom, self.max_atom), dtype=np.int8)
+        structure_out[0, :atom_num] = structure
+        topology_out[0, :atom_num, :atom_num] = topology
+        return structure_out, topology_out
 
-        # read in whole file
-        position = file.tell()  # note pointer position
-        file.seek(0, 0)  # move to start of file
-        filelines = file.readlines()
-        line_max = len(filelines)
-        
-        structure_loc = None
-        Mcharge_loc = None
-        dipole_loc = None
-        Hcharge_loc = None
-
-        # find coordinate and charge location in file
-        for i in range(line_max):
-            if (filelines[i].find('Standard orientation:') != -1):
-                structure_loc = i
-            if ((filelines[i].find('Mulliken charges:') != -1)
-                    or (filelines[i].find('Mulliken charges and spin densities:') != -1)):
-                Mcharge_loc = i
-            if (filelines[i].find('Dipole moment (field-independent basis, Debye):') != -1):
-                dipole_loc = i
-            if (filelines[i].find('Hirshfeld charges, spin densities, dipoles, and CM5 charges') != -1):
-                Hcharge_loc = i
-
-        # read coordinate
-        structure_temp = np.zeros((1, 4), dtype=float)
-        for i in range(structure_loc+5, line_max):  # skip extra 5 lines
-            line_temp = filelines[i]
-            if line_temp.find('-----') != -1:
-                break
-            line_temp = line_temp.split()
-            line_temp = np.array(line_temp, dtype=float)
-            line_temp = np.delete(line_temp, [0, 2])    # delete useless data
-            structure_temp = np.append(structure_temp, [line_temp], axis=0)
-        structure_temp = structure_temp[1:]   # drop first blank item in array
-        structure_temp = np.pad(structure_temp, ((
-            0, self.max_atom-structure_temp.shape[0]), (0, 0)))    # pad rest space with zero
-
-        # read mulliken charge
-        if self.charge_type == 'Mulliken':
-            charge_temp = np.zeros(1, dtype=float)
-            for i in range(Mcharge_loc+2, line_max):  # skip extra 2 lines
-                line_temp = filelines[i]
-                if line_temp.find('Sum of Mulliken charges') != -1:
-                    break
-                line_temp = line_temp.split()
-                line_temp[1] = element_dic(line_temp[1])
-                line_temp = np.array(line_temp, dtype=float)
-                line_temp = np.delete(line_temp, [0, 1])   # delete useless data
-                charge_temp = np.append(charge_temp, line_temp, axis=0)
-            charge_temp = charge_temp[1:]
-            charge_temp = np.pad(
-                charge_temp, (0, self.max_atom-charge_temp.shape[0]))  # pad zeros
-
-        # read hirshfeld charge
-        elif self.charge_type == 'Hirshfeld':
-            if Hcharge_loc is None:
-                raise ValueError('No Hirshfeld charge founded here!')
-            charge_temp = np.zeros(1, dtype=float)
-            for i in range(Hcharge_loc+2, line_max):
-                line_temp = filelines[i]
-                if line_temp.find('Tot') != -1:
-                    break
-                line_temp = line_temp.split()
-                line_temp[1] = element_dic(line_temp[1])
-                line_temp = np.array(line_temp, dtype=float)
-                line_temp = line_temp[2, np.newaxis]
-                charge_temp = np.append(charge_temp, line_temp, axis=0)
-            charge_temp = charge_temp[1:]
-            charge_temp = np.pad(
-                charge_temp, (0, self.max_atom-charge_temp.shape[0]))  # pad zeros
-
-        # read dipole moment
-        line_temp = filelines[dipole_loc+1]
-        line_temp = line_temp.split()
-        dipole_temp = []
-        dipole_temp.append(float(line_temp[1]))
-        dipole_temp.append(float(line_temp[3]))
-        dipole_temp.append(float(line_temp[5]))
-        dipole_temp = np.array(dipole_temp, dtype=float)
-
-        file.seek(position, 0)  # move pointer back to original position
-        return structure_temp, charge_temp, dipole_temp
-
-    def __read_mol(self, file: TextIOWrapper) -> np.ndarray:
+    def __read_mol(self, file: TextIOWrapper) -> tuple:
         """
         Read in .mol file
 
@@ -533,44 +766,14 @@ class Gdata():
         position = file.tell()
         file.seek(0, 0)
 
-        file_content = file.readlines()
-
-        # read atom number
-        atom_num = int(file_content[3].split()[0])
-        if atom_num > self.max_atom:
-            print("Gdata: number of atoms read is larger than maximun allow atom!")
-            print("Gdata: auto change max_atom to %d." % (atom_num))
-            self.change_max_atom(atom_num)
-
-        # read structure coordinate
-        structure = np.zeros((1, self.max_atom, 4), dtype=float)
-        for i in range(atom_num):
-            line_temp = file_content[i+4]
-            line_temp = line_temp.split()
-            structure[0, i, 0] = element_dic(line_temp[3])
-            structure[0, i, 1] = line_temp[0]
-            structure[0, i, 2] = line_temp[1]
-            structure[0, i, 3] = line_temp[2]
-
-        # read topological information
-        topology = np.zeros((1, self.max_atom, self.max_atom), dtype=int)
-        topo_start = 4 + atom_num
-        topo_end = len(file_content) - 1
-
-        for i in range(topo_start, topo_end):
-            line_temp = file_content[i].split()
-            atom_1 = int(line_temp[0]) - 1
-            atom_2 = int(line_temp[1]) - 1
-            bond_order = int(line_temp[2])
-            topology[0, atom_1, atom_2] = bond_order
-            topology[0, atom_2, atom_1] = bond_order
+        structure, topology = parse_mol(file.readlines())
 
         # set back pointer
         file.seek(position, 0)
 
-        return structure, topology
-        
-    def __read_mol2(self, file: TextIOWrapper) -> np.ndarray:
+        return self.__fit_topo_data(structure, topology)
+
+    def __read_mol2(self, file: TextIOWrapper) -> tuple:
         """
         Read in .mol2 file
 
@@ -583,54 +786,287 @@ class Gdata():
 
         position = file.tell()
         file.seek(0, 0)
-        file_content = file.readlines()
-
-        # read general info
-        for line_no in range(len(file_content)):
-            line_temp = file_content[line_no]
-            if line_temp.find('@<TRIPOS>MOLECULE') is not -1:
-                stat_line = file_content[line_no+2]
-                atom_num = int(stat_line.split()[0])
-                bond_num = int(stat_line.split()[1])
-            elif line_temp.find('@<TRIPOS>ATOM') is not -1:
-                atom_start = line_no + 1
-            elif line_temp.find('@<TRIPOS>BOND') is not -1:
-                bond_start = line_no + 1
-
-        # check max_atom
-        if atom_num > self.max_atom:
-            print("Gdata: number of atoms read is larger than maximun allow atom!")
-            print("Gdata: auto change max_atom to %d." % (atom_num))
-            self.change_max_atom(atom_num)
 
-        # read structure info
-        structure = np.zeros((1, self.max_atom, 4), dtype=float)
-        for atom_no in range(atom_num):
-            line_temp = file_content[atom_start+atom_no]
-            line_temp = line_temp.split()
-            structure[0, atom_no, 0] = element_dic(line_temp[5].split('.')[0])
-            structure[0, atom_no, 1] = float(line_temp[2])
-            structure[0, atom_no, 2] = float(line_temp[3])
-            structure[0, atom_no, 3] = float(line_temp[4])
-
-        # read topological info
-        topology = np.zeros((1, self.max_atom, self.max_atom), dtype=int)
-        for bond_no in range(bond_num):
-            line_temp = file_content[bond_start+bond_no]
-            line_temp = line_temp.split()
-            atom_1 = int(line_temp[1]) - 1
-            atom_2 = int(line_temp[2]) - 1
-            bond_type = bond_dic(line_temp[3])
-            topology[0, atom_1, atom_2] = bond_type
-            topology[0, atom_2, atom_1] = bond_type
+        structure, topology = parse_mol2(file.readlines())
 
         # move back pointer
         file.seek(position, 0)
 
-        return structure, topology
+        return self.__fit_topo_data(structure, topology)
+
+    def __thread_map(self, func, items: list, workers: int | None = None):
+        """
+        Map function over items in a thread pool, results are yielded in order of items
+
+        Args:
+            func: function to be called for each item. type <function>
+            items: items to be processed. type <list>
+            workers: number of worker threads, None for default, 1 for serial processing. type <int>
+        Returns:
+            results: results of each item. type <generator>
+        """
+        if workers == 1 or len(items) < _MIN_PARALLEL_FILES:
+            yield from map(func, items)
+            return
+        # imported on first use, not needed for starting up
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(func, items)
+
+    def __try_read(self, full_name: str, reader) -> tuple:
+        """
+        Open and read a file without raising
+
+        Args:
+            full_name: path and name of file. type <str>
+            reader: function taking opened file and returning read data. type <function>
+        Returns:
+            status: 'ok', 'io' for failed opening or 'content' for failed reading. type <str>
+            data: read data, None if failed. type <tuple> or <numpy.ndarray>
+        """
+        try:
+            file = open(full_name, 'r')
+        except:
+            return 'io', None
+        with file:
+            try:
+                return 'ok', reader(file)
+            except:
+                return 'content', None
+
+    def __scan_dir(self, dir_name: str) -> list:
+        """
+        List regular files in directory sorted by name, sub-directories are skipped
+
+        Args:
+            dir_name: path and name of directory. type <str>
+        Returns:
+            entries: directory entries of files. type <list> of <os.DirEntry>
+        """
+        with os.scandir(dir_name) as scan:
+            return sorted((entry for entry in scan if entry.is_file()),
+                          key=lambda entry: entry.name)
+
+    def __load_dir_cache(self, cache_name: str, entries: list) -> bool:
+        """
+        Load parsed directory data from cache if cache is newer than all files in it
+
+        Args:
+            cache_name: path and name of cache file. type <str>
+            entries: directory entries of files currently in directory. type <list> of <os.DirEntry>
+        Returns:
+            load_result: True if valid cache was loaded. type <bool>
+        """
+        if not os.path.exists(cache_name):
+            return False
+
+        # cache is outdated if any file was changed after it was written
+        cache_time = os.path.getmtime(cache_name)
+        for entry in entries:
+            if entry.stat().st_mtime > cache_time:
+                return False
+
+        with np.load(cache_name) as cache:
+            # cache is outdated if files were added or removed
+            if sorted(cache['files'].tolist()) != [entry.name for entry in entries]:
+                return False
+            structures = cache['structure']
+            topologies = cache['topology']
+            names = cache['name']
+
+        # fit cached data to max_atom
+        if structures.shape[1] > self.max_atom:
+            self.change_max_atom(structures.shape[1])
+        pad_num = self.max_atom - structures.shape[1]
+        structures = np.pad(structures, ((0, 0), (0, pad_num), (0, 0)))
+        topologies = np.pad(topologies, ((0, 0), (0, pad_num), (0, pad_num)))
+
+        self.structures = np.concatenate((self.structures, structures), axis=0)
+        self.topologies = np.concatenate((self.topologies, topologies), axis=0)
+        self.names = np.append(self.names, names)
+        print('Gdata:', names.shape[0], 'structures loaded from cache', cache_name)
+        return True
+
+    def __read_topo_dir(self, dir_name: str, file_type: str, workers=None, cache=False):
+        """
+        Read .mol or .mol2 files from folder, files are parsed in worker processes
+
+        Args:
+            dir_name: dir path and name to be read. type <str>
+            file_type: 'mol' or 'mol2'. type <str>
+            workers: number of worker processes, None for all cores, 1 for serial reading. type <int>
+            cache: keep parsed data in a cache file inside the folder and reuse it while
+                   no file in folder is changed. type <bool>
+        Return:
+            None
+        """
+        # check '/'
+        name_len = len(dir_name)
+        if dir_name[name_len-1] != '/':
+            dir_name = dir_name + '/'
+
+        # cache files are not data files
+        entries = [entry for entry in self.__scan_dir(dir_name)
+                   if not entry.name.startswith(_DIR_CACHE_PREFIX)]
+
+        cache_name = dir_name + _DIR_CACHE_PREFIX + file_type + '.npz'
+        if cache == True and self.__load_dir_cache(cache_name, entries):
+            return
+        file_list = [entry.name for entry in entries]
+        full_names = [entry.path for entry in entries]
+
+        file_num = len(file_list)
+        fail_num = 0
+        # pre-allocate buffers for all files, filled by index
+        structures = np.zeros((file_num, self.max_atom, 4), dtype=np.float32)
+        topologies = np.zeros(
+            (file_num, self.max_atom, self.max_atom), dtype=np.int8)
+        names = []
+        k = 0   # write cursor
+        print('Gdata: Start reading', file_type, 'data from', dir_name)
+
+        executor = None
+        if workers == 1 or file_num < _MIN_PARALLEL_FILES:
+            results = map(read_topo_file, full_names, [file_type] * file_num)
+        else:
+            # imported on first use, not needed for starting up
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(read_topo_file, full_names,
+                                   [file_type] * file_num, chunksize=16)
+        try:
+            for file_name, result in tqdm(zip(file_list, results), total=file_num):
+                # skip wrong file
+                if result is None:
+                    print('Gdata: Fail to read file', dir_name + file_name, 'Skipped!')
+                    fail_num = fail_num + 1
+                    continue
+                structure, topology = self.__fit_topo_data(*result)
+                # max_atom may be raised by reader, widen buffers accordingly
+                pad_num = self.max_atom - structures.shape[1]
+                if pad_num > 0:
+                    structures = np.pad(structures, ((0, 0), (0, pad_num), (0, 0)))
+                    topologies = np.pad(
+                        topologies, ((0, 0), (0, pad_num), (0, pad_num)))
+                structures[k] = structure[0]
+                topologies[k] = topology[0]
+                names.append(self.__find_real_name(file_name))
+                k = k + 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # append all read data at once
+        self.structures = np.concatenate(
+            (self.structures, structures[:k]), axis=0)
+        self.topologies = np.concatenate(
+            (self.topologies, topologies[:k]), axis=0)
+        self.names = np.append(self.names, names)
+
+        print('Gdata:', file_num - fail_num,
+                file_type, 'files read successfully!', fail_num, 'failed')
+
+        if cache == True:
+            np.savez_compressed(cache_name,
+                                structure=structures[:k],
+                                topology=topologies[:k],
+                                name=np.array(names, dtype=str),
+                                files=np.array(file_list, dtype=str))
+            print('Gdata: parsed data cached as:', cache_name)
+
+    def __save_npy(self, file_name: str, data: np.ndarray):
+        """
+        Save array as .npy file through a temporary file, the target is only replaced once it is fully written.
+        Temporary file is removed if saving fails, e.g. on Windows the target can not be replaced
+        while it is memory mapped.
+
+        Args:
+            file_name: path and name of .npy file, '.npy' is appended if missing like numpy.save. type <str>
+            data: array to be saved. type <numpy.ndarray>
+        Returns:
+            None
+        """
+        if not file_name.endswith('.npy'):
+            file_name = file_name + '.npy'
+        temp_name = file_name + '.tmp'
+        try:
+            with open(temp_name, 'wb') as file:
+                np.save(file, data)
+            os.replace(temp_name, file_name)
+        except:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+
+    def __mount(self,
+                structures: np.ndarray=None,
+                charges: np.ndarray=None,
+                names: np.ndarray=None,
+                topologies: np.ndarray=None,
+                dipoles: np.ndarray=None,
+                config: np.ndarray=None):
+        """
+        Validate loaded data and mount them to class. Existing data will be erased.
+
+        Args:
+            structures: array of structure data. type <np.ndarray>
+            charges: array of charge data. type <np.ndarray>
+            names: array of name data. type <np.ndarray>
+            topologies: array of topology data. type <np.ndarray>
+            dipoles: array of dipole moment data. type <np.ndarray>
+            config: array of config info. type <np.ndarray>
+        Returns:
+            None
+        """
+        if structures is not None:
+            structures = structures.astype(np.float32, copy=False)
+        if charges is not None:
+            charges = charges.astype(np.float32, copy=False)
+        if topologies is not None:
+            topologies = topologies.astype(np.int8, copy=False)
+        # dipole moments saved by older versions are float64
+        if dipoles is not None:
+            dipoles = dipoles.astype(np.float32, copy=False)
+        if config is not None:
+            # extract config info
+            # config info are stored as np.array [max_atom, charge_type, mi_coor], dtype=str
+            max_atom = int(config[0])
+            charge_type = str(config[1])
+            mi_coor = config[2] == 'True'
+        else:
+            print('Gdata: warining: no config file detected!')
+            max_atom = self.max_atom
+
+        # data check
+        if self.__data_check(structures, charges, names, topologies, dipoles) == True:
+            # get max_atom
+            self.max_atom = max_atom
+            # reinitialise value
+            self.delete_structures()
+            self.delete_charges()
+            self.delete_names()
+            self.delete_topologies()
+            self.delete_dipole()
+            # mount loaded data to class directly, no extra copy needed
+            if structures is not None:
+                self.structures = structures
+            if charges is not None:
+                self.charges = charges
+            if names is not None:
+                self.names = names
+            if topologies is not None:
+                self.topologies = topologies
+            if dipoles is not None:
+                self.dipoles = dipoles
+            if config is not None:
+                self.charge_type = charge_type
+                self.mi_coor = mi_coor
+
+            print('Gdata:', self.get_data_shape().max(), 'data loaded and validated.',
+                      'Maximum allowed atom changed to', self.max_atom)
 
     """ PUBLIC """
-    def copy(self):
+    def copy(self) -> Gdata:
         """
         Copy current gdata object
 
@@ -651,54 +1087,19 @@ class Gdata():
         gdata_copied.mi_coor = self.mi_coor
         return gdata_copied
 
-    def read_mol2_dir(self, dir_name: str):
+    def read_mol2_dir(self, dir_name: str, workers=None, cache=False):
         """
         Read .mol2 files from folder
 
         Args:
             dir_name: dir path and name to be read. type <str>
+            workers: number of worker processes, None for all cores, 1 for serial reading. type <int>
+            cache: keep parsed data in a cache file inside the folder and reuse it while
+                   no file in folder is changed. type <bool>
         Return:
             None
         """
-        # check '/'
-        name_len = len(dir_name)
-        if dir_name[name_len-1] != '/':
-            dir_name = dir_name + '/'
-
-        file_list = os.listdir(dir_name)
-
-        file_num = len(file_list)
-        fail_num = 0
-        print('Gdata: Start reading mol2 data from', dir_name)
-        for file_name in tqdm(file_list):
-            full_name = dir_name + file_name    # conbine name
-
-            # skip wrong file
-            try:
-                file = open(full_name, 'r')
-            except:
-                print('Gdata: Fail to open file', full_name, 'Skipped!')
-                fail_num = fail_num + 1
-                continue
-
-            try:
-                structure, topology = self.__read_mol2(file)
-            except:
-                print('Gdata: Fail to read file', full_name, 'Skipped!')
-                fail_num = fail_num + 1
-                continue
-            real_name = self.__find_real_name(file_name)
-            # append this structure to list
-            self.structures = np.append(
-                self.structures, structure, axis=0)
-            # append this topology to list
-            self.topologies = np.append(self.topologies, topology, axis=0)
-            # append this name to list
-            self.names = np.append(self.names, real_name)
-            file.close()
-
-        print('Gdata:', file_num - fail_num,
-                'mol2 files read successfully!', fail_num, 'failed')
+        self.__read_topo_dir(dir_name, 'mol2', workers, cache)
 
     def read_mol2_file(self, file_name: str):
         """
@@ -715,63 +1116,27 @@ class Gdata():
 
         real_name = self.__find_real_name(file_name)
 
-        self.structures = np.append(self.structures, strucutre, axis=0)
-        self.topologies = np.append(self.topologies, topology, axis=0)
-        self.names = np.append(self.names, real_name)
+        # grow stored data in place
+        self.add_data(structure=strucutre, name=real_name, topology=topology)
 
         file.close()
 
         print('Gdata: mol2 file successfully read:', file_name)
 
 
-    def read_mol_dir(self, dir_name: str):
+    def read_mol_dir(self, dir_name: str, workers=None, cache=False):
         """
         Read .mol files from folder
 
         Args:
             dir_name: dir path and name to be read. type <str>
+            workers: number of worker processes, None for all cores, 1 for serial reading. type <int>
+            cache: keep parsed data in a cache file inside the folder and reuse it while
+                   no file in folder is changed. type <bool>
         Return:
             None
         """
-        # check '/'
-        name_len = len(dir_name)
-        if dir_name[name_len-1] != '/':
-            dir_name = dir_name + '/'
-
-        file_list = os.listdir(dir_name)
-
-        file_num = len(file_list)
-        fail_num = 0
-        print('Gdata: Start reading mol data from', dir_name)
-        for file_name in tqdm(file_list):
-            full_name = dir_name + file_name    # conbine name
-
-            # skip wrong file
-            try:
-                file = open(full_name, 'r')
-            except:
-                print('Gdata: Fail to open file', full_name, 'Skipped!')
-                fail_num = fail_num + 1
-                continue
-
-            try:
-                structure, topology = self.__read_mol(file)
-            except:
-                print('Gdata: Fail to read file', full_name, 'Skipped!')
-                fail_num = fail_num + 1
-                continue
-            real_name = self.__find_real_name(file_name)
-            # append this structure to list
-            self.structures = np.append(
-                self.structures, structure, axis=0)
-            # append this topology to list
-            self.topologies = np.append(self.topologies, topology, axis=0)
-            # append this name to list
-            self.names = np.append(self.names, real_name)
-            file.close()
-
-        print('Gdata:', file_num - fail_num,
-                'mol files read successfully!', fail_num, 'failed')
+        self.__read_topo_dir(dir_name, 'mol', workers, cache)
 
     def read_mol_file(self, file_name: str):
         """
@@ -788,9 +1153,8 @@ class Gdata():
 
         real_name = self.__find_real_name(file_name)
 
-        self.structures = np.append(self.structures, strucutre, axis=0)
-        self.topologies = np.append(self.topologies, topology, axis=0)
-        self.names = np.append(self.names, real_name)
+        # grow stored data in place
+        self.add_data(structure=strucutre, name=real_name, topology=topology)
 
         file.close()
 
@@ -811,13 +1175,17 @@ class Gdata():
         coordingnate = self.get_structures(coor_only=True)
         atom_info = self.get_atom_info()
         atm_dst = np.zeros((data_num, self.max_atom, self.max_atom))
-        for molecule in tqdm(range(data_num)):
-            for atom1 in range(self.max_atom):
-                for atom2 in range(self.max_atom):
-                    if atom_info[molecule, atom1] * atom_info[molecule, atom2] == 0:
-                        atm_dst[molecule, atom1, atom2] = 0
-                        continue
-                    atm_dst[molecule, atom1, atom2] = np.linalg.norm(coordingnate[molecule, atom1] - coordingnate[molecule, atom2])
+        # molecules are processed in chunks to keep pair differences small
+        chunk_size = 256
+        for start in tqdm(range(0, data_num, chunk_size)):
+            end = min(start + chunk_size, data_num)
+            coor = coordingnate[start:end]
+            diff = coor[:, :, np.newaxis, :] - coor[:, np.newaxis, :, :]
+            dst = np.sqrt(np.einsum('nijk,nijk->nij', diff, diff))
+            # distance involving blank atom is zero
+            exist = atom_info[start:end] != 0
+            dst *= exist[:, :, np.newaxis] & exist[:, np.newaxis, :]
+            atm_dst[start:end] = dst
         return atm_dst
 
     def convert_to_mi_coordinate(self) -> np.ndarray:
@@ -832,24 +1200,21 @@ class Gdata():
         """
         inert_tensor = self.get_moment_of_inertia_tensor()
         print('Gdata: converting structure to MI based coordinates...')
-        eig_val, eig_vec = np.linalg.eig(inert_tensor)
+        # inertia tensors are symmetric, all molecules are decomposed in one batched call
+        # eigen vectors are stored in columns: eig_vec[molecule, :, i]
+        eig_val, eig_vec = np.linalg.eigh(inert_tensor)
         coordinates = self.get_structures(coor_only=True)
-        atom_info = self.get_atom_info()[:, :, np.newaxis]
+        atom_info = self.get_atom_info()
         data_num = self.get_data_shape()[0]
-        self.structures = np.zeros((1, self.max_atom, 4), dtype=float)
-        for molecule in tqdm(range(data_num)):
-            mol_coor_temp = np.zeros((1, 3))
-            for atom in range(self.max_atom):
-                mi_x = np.dot(coordinates[molecule, atom], eig_vec[molecule, 0])
-                mi_y = np.dot(coordinates[molecule, atom], eig_vec[molecule, 1])
-                mi_z = np.dot(coordinates[molecule, atom], eig_vec[molecule, 2])
-                atom_coor_temp = np.array((mi_x, mi_y, mi_z))
-                mol_coor_temp = np.append(mol_coor_temp, [atom_coor_temp], axis=0)
-            mol_struc_temp = np.concatenate((atom_info[molecule], mol_coor_temp[1:]), axis=1)
-            self.structures = np.append(self.structures, [mol_struc_temp], axis=0)
+        # project every atom onto the three principal axes of its molecule,
+        # as one batched matrix product [max_atom, 3] x [3, 3] per molecule
+        mi_coordinates = np.matmul(coordinates, eig_vec)
+        self.structures = np.zeros((data_num, self.max_atom, 4), dtype=np.float32)
+        self.structures[:, :, 0] = atom_info
+        self.structures[:, :, 1:] = mi_coordinates
 
         self.mi_coor = True
-        return self.structures[1:]
+        return self.structures
 
 
     def get_moment_of_inertia_tensor(self) -> np.ndarray:
@@ -865,54 +1230,32 @@ class Gdata():
             print('Gdata: there is no structure data in this class!')
             raise
 
-        cm = self.get_mass_centre()
+        # fetch stored data once and reuse below
+        atom_info = self.get_atom_info()
+        atom_weight = atom_mass_dict(atom_info)
+        orig_coor = self.get_structures(coor_only=True)
+
+        # mass centre = \frac{\sum_i m_i r_i}{\sum_i m_i}, same as get_mass_centre()
+        cm = np.sum(atom_weight[:, :, np.newaxis]*orig_coor, axis=1) / np.sum(atom_weight, axis=1)[:, np.newaxis]
 
-        
         # move original point to mass centre
         print('Gdata: shifting coordinate centre to mass centre...')
-        orig_coor = self.get_structures(coor_only=True)
-        cm_atom_vec = orig_coor - np.repeat(cm[:, np.newaxis, :], self.max_atom, axis=1)
-        for molecule in tqdm(range(self.get_data_shape()[0])):   # set ghost atoms as 0
-            cm_atom_vec[cm_atom_vec == -cm[molecule]] = 0
-
-        atom_weight = self.get_atom_weight()
+        cm_atom_vec = orig_coor - cm[:, np.newaxis, :]
+        # set ghost atoms as 0
+        cm_atom_vec[atom_info == 0] = 0
 
         print('Gdata: building moment of inertial tensor...')
-        x = cm_atom_vec[:, :, 0]
-        y = cm_atom_vec[:, :, 1]
-        z = cm_atom_vec[:, :, 2]
-
-        # Ixx = \sum_i m_i (y_i^2 + z_i^2)
-        Ixx = np.sum(atom_weight*(y**2+z**2), axis=1)
-        # Iyy = \sum_i m_i (x_i^2 + z_i^2)
-        Iyy = np.sum(atom_weight*(x**2+z**2), axis=1)
-        # Izz = \sum_i m_i (y_i^2 + x_i^2)
-        Izz = np.sum(atom_weight*(y**2+x**2), axis=1)
-        # Ixy = Iyx = -\sum_i m_i x_i y_i
-        Ixy = -np.sum(atom_weight*x*y, axis=1)
-        # Iyz = Izy = -\sum_i m_i y_i z_i
-        Iyz = -np.sum(atom_weight*y*z, axis=1)
-        # Ixz = Izx = -\sum_i m_i x_i z_i
-        Ixz = -np.sum(atom_weight*x*z, axis=1)
-
-        inert_tensor = np.zeros((1, 3, 3), dtype=float)
-        for molecule in tqdm(range(self.get_data_shape()[0])):
-            inert_temp = np.zeros((3, 3))
-            inert_temp[0, 0] = Ixx[molecule]
-            inert_temp[0, 1] = Ixy[molecule]
-            inert_temp[0, 2] = Ixz[molecule]
-            inert_temp[1, 0] = Ixy[molecule]
-            inert_temp[1, 1] = Iyy[molecule]
-            inert_temp[1, 2] = Iyz[molecule]
-            inert_temp[2, 0] = Ixz[molecule]
-            inert_temp[2, 1] = Iyz[molecule]
-            inert_temp[2, 2] = Izz[molecule]
-            inert_tensor = np.append(inert_tensor, [inert_temp], axis=0)
-
-        return inert_tensor[1:]
-
-
-    def get_atom_weight(self):
+        # S = \sum_i m_i r_i r_i^T, all six moments in one pass
+        S = np.einsum('ma,mai,maj->mij', atom_weight, cm_atom_vec, cm_atom_vec, optimize=True)
+        # I = \sum_i m_i (r_i^T r_i E - r_i r_i^T) = tr(S) E - S
+        # e.g. Ixx = \sum_i m_i (y_i^2 + z_i^2), Ixy = -\sum_i m_i x_i y_i
+        trace = np.trace(S, axis1=1, axis2=2)
+        inert_tensor = np.eye(3) * trace[:, np.newaxis, np.newaxis] - S
+
+        return inert_tensor
+
+
+    def get_atom_weight(self) -> np.ndarray:
         """
         Get atom weight info
 
@@ -921,9 +1264,8 @@ class Gdata():
         Return:
             atom_weight: type <numpy.ndarray>
         """
-        atom_info = self.get_atom_info()
-        a_shape = atom_info.shape
-        atom_weight = np.reshape(atom_mass_dict(atom_info.flatten()), a_shape)
+        # gather masses by atomic number, unsupported elements raise KeyError
+        atom_weight = atom_mass_dict(self.get_atom_info())
         return atom_weight
 
 
@@ -964,38 +1306,39 @@ class Gdata():
         """
 
         if type(structure) == np.ndarray:
+            structure = structure.astype(np.float32, copy=False)
             if structure.ndim == 2:
-                self.structures = np.append(
-                    self.structures, [structure], axis=0)
+                self._structures.extend([structure])
             elif structure.ndim == 3:
-                self.structures = np.append(self.structures, structure, axis=0)
+                self._structures.extend(structure)
             else:
                 print('Gdata: structure data dimension error!')
                 raise
         if type(charge) == np.ndarray:
+            charge = charge.astype(np.float32, copy=False)
             if charge.ndim == 1:
-                self.charges = np.append(self.charges, [charge], axis=0)
+                self._charges.extend([charge])
             elif charge.ndim == 2:
-                self.charges = np.append(self.charges, charge, axis=0)
+                self._charges.extend(charge)
             else:
                 print('Gdata: charge data dimension error!')
                 raise
         if type(name) != type(None):
-            self.names = np.append(self.names, name)
+            self._names.extend(np.ravel(name))
         if type(topology) == np.ndarray:
+            topology = topology.astype(np.int8, copy=False)
             if topology.ndim == 2:
-                self.topologies = np.append(
-                    self.topologies, [topology], axis=0)
+                self._topologies.extend([topology])
             elif topology.ndim == 3:
-                self.topologies = np.append(self.topologies, topology, axis=0)
+                self._topologies.extend(topology)
             else:
                 print('Gdata: topology data dimension error!')
                 raise
         if type(dipole) == np.ndarray:
             if dipole.ndim == 1:
-                self.dipoles = np.append(self.dipoles, [dipole], axis=0)
+                self._dipoles.extend([dipole])
             elif dipole.ndim == 2:
-                self.dipoles = np.append(self.dipoles, dipole, axis=0)
+                self._dipoles.extend(dipole)
             else:
                 print('Gdata: dipole moment data dimension error!') 
 
@@ -1011,14 +1354,20 @@ class Gdata():
 
         data_num = self.get_data_shape().max()
 
-        self.structures = np.pad(
-            self.structures, ((0, data_num-self.get_data_shape()[0]), (0, 0), (0, 0)))
-        self.charges = np.pad(
-            self.charges, ((0, data_num-self.get_data_shape()[1]), (0, 0)))
-        self.names = np.pad(self.names, (0, data_num-self.get_data_shape()[2]))
-        self.topologies = np.pad(
-            self.topologies, ((0, data_num-self.get_data_shape()[3]), (0, 0), (0, 0)))
-        self.dipoles = np.pad(self.dipoles, ((0, data_num-self.get_data_shape()[4]), (0, 0)))
+        def pad_data(data: np.ndarray) -> np.ndarray:
+            # nothing to pad
+            if data.shape[0] == data_num:
+                return data
+            # fresh zero array in final shape, existing data copied to the front
+            padded = np.zeros((data_num,) + data.shape[1:], dtype=data.dtype)
+            padded[:data.shape[0]] = data
+            return padded
+
+        self.structures = pad_data(self.structures)
+        self.charges = pad_data(self.charges)
+        self.names = pad_data(self.names)
+        self.topologies = pad_data(self.topologies)
+        self.dipoles = pad_data(self.dipoles)
 
     def delete_dipole(self):
         """
@@ -1029,7 +1378,7 @@ class Gdata():
         Return:
             None
         """
-        self.dipoles = np.zeros((1, 3), dtype=float)
+        self.dipoles = np.zeros((0, 3), dtype=np.float32)
 
     def delete_topologies(self):
         """
@@ -1041,7 +1390,7 @@ class Gdata():
             None
         """
         self.topologies = np.zeros(
-            (1, self.max_atom, self.max_atom), dtype=int)
+            (0, self.max_atom, self.max_atom), dtype=np.int8)
 
     def delete_names(self):
         """
@@ -1052,7 +1401,7 @@ class Gdata():
         Returns:
             None
         """
-        self.names = np.zeros(1, dtype=str)
+        self.names = np.zeros(0, dtype=str)
 
     def delete_charges(self):
         """
@@ -1063,7 +1412,7 @@ class Gdata():
         Returns:
             None
         """
-        self.charges = np.zeros((1, self.max_atom), dtype=float)
+        self.charges = np.zeros((0, self.max_atom), dtype=np.float32)
 
     def delete_structures(self):
         """
@@ -1074,7 +1423,7 @@ class Gdata():
         Returns:
             None
         """
-        self.structures = np.zeros((1, self.max_atom, 4), dtype=float)
+        self.structures = np.zeros((0, self.max_atom, 4), dtype=np.float32)
 
     def change_max_atom(self, new_max_atom: int):
         """
@@ -1114,33 +1463,18 @@ class Gdata():
         Return:
             check_result: if True, data has passed the check. type <bool>
         """
-        structures = None
-        charges = None
-        names = None
-        topologies = None
-        dipoles = None
-
-        if np.count_nonzero(self.structures) > 0:
-            structures = self.structures[1:]
-        if np.count_nonzero(self.charges) > 0:
-            charges = self.charges[1:]
-        if np.count_nonzero(self.names) > 0:
-            names = self.names[1:]
-        if np.count_nonzero(self.topologies) > 0:
-            topologies = self.topologies[1:]
-        if np.count_nonzero(self.dipoles) > 0:
-            dipoles = self.dipoles[1:]
-
-        return self.__data_check(structures, charges, names, topologies, dipoles)
+        # empty data sets are skipped by data number check, only shapes are compared
+        return self.__data_check(self.structures, self.charges, self.names, self.topologies, self.dipoles)
 
     # read zmat files from directory
 
-    def read_zmat_dir(self, dir_name: str):
+    def read_zmat_dir(self, dir_name: str, workers=None):
         """
         Read all zmat files from directory
 
         Args:
             dir_name: path and name of the directory. type <str>
+            workers: number of worker threads, None for default, 1 for serial reading. type <int>
         Returns:
             None
         """
@@ -1149,37 +1483,43 @@ class Gdata():
         if dir_name[name_len-1] != '/':
             dir_name = dir_name + '/'
 
-        file_list = os.listdir(dir_name)
+        # directory entries carry file name and path
+        entries = self.__scan_dir(dir_name)
+        file_list = [entry.name for entry in entries]
+        full_names = [entry.path for entry in entries]
 
         file_num = len(file_list)
         io_error_names = []
         content_error_names = []
+        # read data are collected and stored at once
+        coordinate_list = []
+        topology_list = []
+        name_list = []
 
         print('Gdata: Start reading zmat data from %s' % (dir_name))
-        for file_name in tqdm(file_list):
-            full_name = dir_name + file_name    # conbine name
-
+        results = self.__thread_map(
+            lambda full_name: self.__try_read(full_name, self.__read_zmat), full_names, workers)
+        for file_name, full_name, (status, result) in tqdm(zip(file_list, full_names, results), total=file_num):
             # skip wrong file
-            try:
-                file = open(full_name, 'r')
-            except:
+            if status == 'io':
                 io_error_names.append(full_name)
                 continue
-
-            try:
-                coordinate, topology = self.__read_zmat(file)
-            except:
+            if status == 'content':
                 content_error_names.append(full_name)
                 continue
 
-            real_name = self.__find_real_name(file_name)
+            coordinate, topology = result
             # append this structure to list
-            self.structures = np.append(
-                self.structures, [coordinate], axis=0)
-            self.topologies = np.append(
-                self.topologies, [topology], axis=0)
-            self.names = np.append(self.names, real_name)
-            file.close()
+            coordinate_list.append(coordinate)
+            topology_list.append(topology)
+            name_list.append(self.__find_real_name(file_name))
+
+        if len(name_list) != 0:
+            self.structures = np.concatenate(
+                (self.structures, np.stack(coordinate_list)), axis=0)
+            self.topologies = np.concatenate(
+                (self.topologies, np.stack(topology_list)), axis=0)
+            self.names = np.append(self.names, name_list)
 
         io_error_num = len(io_error_names)
         content_error_num = len(content_error_names)
@@ -1220,10 +1560,8 @@ class Gdata():
 
         real_name = self.__find_real_name(file_name)
 
-        # append this structure to list
-        self.structures = np.append(self.structures, [structure], axis=0)
-        self.names = np.append(self.names, real_name)
-        self.topologies = np.append(self.topologies, [topology], axis=0)
+        # append this structure to stored data, grown in place
+        self.add_data(structure=structure, name=real_name, topology=topology)
         file.close()
 
         print('Gdata: zmat file read successfully: %s' % file_name)
@@ -1239,11 +1577,10 @@ class Gdata():
         Return:
             min_max_atom: the minimun allowed max_atom number of this set
         """
-        max_atom_list = np.zeros(1, dtype=int)
-
-        max_atom_list = np.append(max_atom_list, np.count_nonzero(self.structures, axis=1).max())
-        max_atom_list = np.append(max_atom_list, np.count_nonzero(self.charges, axis=1).max())
-        max_atom_num = np.max(max_atom_list[1:])
+        # number of atoms with any non-zero structure or charge info in each molecule
+        structure_atom_num = np.any(self.structures, axis=2).sum(axis=1).max(initial=0)
+        charge_atom_num = np.count_nonzero(self.charges, axis=1).max(initial=0)
+        max_atom_num = int(max(structure_atom_num, charge_atom_num))
         if max_atom_num < 1:
             print('Gdata: Unable to minimise this class. max_atom not changed.')
             return 0
@@ -1261,13 +1598,14 @@ class Gdata():
 
     # convert to xyz
 
-    def convert_to_xyz(self, directory: str, header=True):
+    def convert_to_xyz(self, directory: str, header=True, workers=None):
         """
         Convert stored structure data to xyz format
 
         Args:
             directory: directory of output files. type <str>
             header: if True, print .xyz header. type <bool>
+            workers: number of worker threads, None for default, 1 for serial writing. type <int>
         Returns:
             None
         """
@@ -1281,35 +1619,35 @@ class Gdata():
         if os.path.exists(directory) == False:
             os.mkdir(directory)
 
-        structures = self.structures[1:]
-        names = self.names[1:]
+        structures = self.structures
+        names = self.names
 
         data_num = self.get_data_shape()[0]
 
         fail_names = []
 
-        # write xyz
-        print('Gdata: Start writing xyz files...')
-        for i in tqdm(range(data_num)):
-            file_name = names[i] + '.xyz'
-            full_name = directory + file_name
-            try:
-                file = open(full_name, 'w+')
-            except:
-                fail_names.append(file_name)
-                continue
-
-            atom_num = self.__write_xyz(file, structures[i])
+        def write_file(i: int) -> bool:
+            full_name = directory + names[i] + '.xyz'
+            atom_num, xyz_lines = self.__format_xyz(structures[i])
 
             # print header
             if header == True:
-                file.seek(0, 0)
-                file_lines = file.readlines()
-                header_line = str(atom_num) + '\n\n'
-                file_lines.insert(0, header_line)
-                file.seek(0, 0)
-                file.writelines(file_lines)
-                file.close()
+                xyz_lines = str(atom_num) + '\n\n' + xyz_lines
+
+            # whole file in one write
+            try:
+                with open(full_name, 'w') as file:
+                    file.write(xyz_lines)
+            except:
+                return False
+            return True
+
+        # write xyz
+        print('Gdata: Start writing xyz files...')
+        results = self.__thread_map(write_file, range(data_num), workers)
+        for i, success in enumerate(tqdm(results, total=data_num)):
+            if success == False:
+                fail_names.append(names[i] + '.xyz')
 
         fail_num = len(fail_names)
         print('Gdata: %d xyz files writed successfully!' % (data_num-fail_num))
@@ -1328,25 +1666,48 @@ class Gdata():
                          type <numpy.ndarray>
         """
 
-        structure_shape = self.structures.shape[0] - 1
-        charge_shape = self.charges.shape[0] - 1
-        name_shape = self.names.shape[0] - 1
-        topology_shape = self.topologies.shape[0] - 1
-        dipole_shape = self.dipoles.shape[0] - 1
+        structure_shape = self.structures.shape[0]
+        charge_shape = self.charges.shape[0]
+        name_shape = self.names.shape[0]
+        topology_shape = self.topologies.shape[0]
+        dipole_shape = self.dipoles.shape[0]
 
         shape_array = np.array(
             [structure_shape, charge_shape, name_shape, topology_shape, dipole_shape], dtype=int)
 
         return shape_array
 
+    def existence_flags(self) -> tuple:
+        """
+        Check which data are stored in class, for structures, charges, names, topologies and dipole moments
+
+        Args:
+            None
+        Return:
+            flags: True if data exist, in order of [structures, charges, names, topologies, dipole moments].
+                   Data filled with zeros only (e.g. padded by merge) are not counted. type <tuple>
+        """
+
+        # empty data are found by shape, data are only scanned if there are rows
+        # first row decides in usual case, whole array is only scanned if it is all zero
+        def exist(data: np.ndarray) -> bool:
+            return data.shape[0] > 0 and (bool(data[0].any()) or bool(data.any()))
+
+        return (exist(self.structures),
+                exist(self.charges),
+                self.names.shape[0] > 0,
+                exist(self.topologies),
+                exist(self.dipoles))
+
     # read xyz files from dir
 
-    def read_xyz_dir(self, dir_name: str, header=True):
+    def read_xyz_dir(self, dir_name: str, header=True, workers=None):
         """
         Read all xyz files in the directory. Store in self.structures and self.names
 
         Args:
             dir_name: path/name of directory. type <str>
+            workers: number of worker threads, None for default, 1 for serial reading. type <int>
         Returns:
             None
         """
@@ -1356,33 +1717,38 @@ class Gdata():
         if dir_name[name_len-1] != '/':
             dir_name = dir_name + '/'
 
-        file_list = os.listdir(dir_name)
+        # directory entries carry file name and path
+        entries = self.__scan_dir(dir_name)
+        file_list = [entry.name for entry in entries]
+        full_names = [entry.path for entry in entries]
 
         file_num = len(file_list)
         fail_num = 0
+        # read data are collected and stored at once
+        coordinate_list = []
+        name_list = []
         print('Gdata: Start reading xyz data from', dir_name)
-        for file_name in tqdm(file_list):
-            full_name = dir_name + file_name    # conbine name
-
+        results = self.__thread_map(
+            lambda full_name: self.__try_read(full_name, lambda file: self.__read_xyz(file, header)),
+            full_names, workers)
+        for file_name, full_name, (status, coordinate) in tqdm(zip(file_list, full_names, results), total=file_num):
             # skip wrong file
-            try:
-                file = open(full_name, 'r')
-            except:
+            if status == 'io':
                 print('Gdata: Fail to open file', full_name, 'Skipped!')
                 fail_num = fail_num + 1
                 continue
-
-            try:
-                coordinate = self.__read_xyz(file, header)
-            except:
+            if status == 'content':
                 print('Gdata: Fail to read file', full_name, 'Skipped!')
+                fail_num = fail_num + 1
                 continue
-            real_name = self.__find_real_name(file_name)
             # append this structure to list
-            self.structures = np.append(
-                self.structures, [coordinate], axis=0)
-            self.names = np.append(self.names, real_name)
-            file.close()
+            coordinate_list.append(coordinate)
+            name_list.append(self.__find_real_name(file_name))
+
+        if len(name_list) != 0:
+            self.structures = np.concatenate(
+                (self.structures, np.stack(coordinate_list)), axis=0)
+            self.names = np.append(self.names, name_list)
 
         print('Gdata:', file_num - fail_num,
                 'xyz files read successfully!', fail_num, 'failed')
@@ -1402,10 +1768,10 @@ class Gdata():
 
         file = open(file_name, 'r')
         coordinate = self.__read_xyz(file, header)
-        self.structures = np.append(self.structures, [coordinate], axis=0)
 
         real_name = self.__find_real_name(file_name)
-        self.names = np.append(self.names, real_name)
+        # grow stored data in place
+        self.add_data(structure=coordinate, name=real_name)
 
         print('Gdata: xyz file successfully read:', file_name)
         print('Gdata: Warning: Reading xyz files cannot obtain charge information.')
@@ -1425,9 +1791,9 @@ class Gdata():
             dipole: dipole moment information. type <numpy.ndarray>
             *** return None if no data avaliable
         """
-        dipole_output = self.dipoles[1:]
+        dipole_output = self.dipoles
         # if no dipole data
-        if dipole_output.shape[0] is 0:
+        if dipole_output.shape[0] == 0:
             return None
         if style == 'xyz':
             return dipole_output
@@ -1451,12 +1817,10 @@ class Gdata():
         # if no adjacency
         if adjacency is None:
             return None
+        # row sums on diagonal
         degree = np.zeros(adjacency.shape)
-
-        for data_num in range(adjacency.shape[0]):
-            for rowcol in range(adjacency.shape[1]):
-                degree[data_num, rowcol, rowcol] = np.sum(
-                    adjacency[data_num, rowcol])
+        diag = np.arange(adjacency.shape[1])
+        degree[:, diag, diag] = adjacency.sum(axis=2)
 
         return degree
 
@@ -1473,14 +1837,15 @@ class Gdata():
         """
         
         
-        adjacency = self.get_topologies()
-        
+        topologies = self.get_topologies()
+
         # if no topologies
-        if adjacency is 0:
+        if topologies is None:
             return None
 
         # modified topologies to ajacency matrix, move all non-zero to 1
-        adjacency[adjacency != 0] = 1
+        # new array is built, stored topologies are kept unchanged
+        adjacency = (topologies != 0).astype(topologies.dtype)
 
         # add identity
         if self_loop == True:
@@ -1506,22 +1871,21 @@ class Gdata():
             *** return None if no data avaliable
         """
 
-        atom_info = np.array(self.structures[1:, :, 0], dtype=int)
+        atom_info = np.array(self.structures[:, :, 0], dtype=int)
 
         # if no info
-        if atom_info.shape[0] is 0:
+        if atom_info.shape[0] == 0:
             return None
 
 
         if style == 'matrix':
-            atom_matrix = np.zeros((1, self.max_atom, self.max_atom), dtype=int)
-            data_num = self.get_data_shape()[0]
-            for i in range(data_num):
-                atom_temp = np.zeros((self.max_atom, self.max_atom), dtype=int)
-                np.fill_diagonal(atom_temp, atom_info[i])
-                atom_matrix = np.append(atom_matrix, [atom_temp], axis=0)
+            # atomic numbers on diagonal of each molecule
+            atom_matrix = np.zeros(
+                (atom_info.shape[0], self.max_atom, self.max_atom), dtype=int)
+            diag = np.arange(self.max_atom)
+            atom_matrix[:, diag, diag] = atom_info
 
-            return atom_matrix[1:]
+            return atom_matrix
 
         elif style == 'array':
             return atom_info
@@ -1537,10 +1901,10 @@ class Gdata():
             topologies: and matrix of topologies info. type <numpy.ndarray>
             *** return None if no data avaliable
         """
-        topologies = self.topologies[1:]
+        topologies = self.topologies
 
         # if no data
-        if topologies.shape[0] is 0:
+        if topologies.shape[0] == 0:
             return None
 
         if self_loop == True:
@@ -1562,10 +1926,10 @@ class Gdata():
             names: an array of read files name. type <numpy.ndarray>
             *** return None if no data avaliable
         """
-        name_output = self.names[1:]
+        name_output = self.names
 
         # if no data
-        if name_output.shape[0] is 0:
+        if name_output.shape[0] == 0:
             return None
         return name_output
 
@@ -1585,23 +1949,19 @@ class Gdata():
             *** return None if no data avaliable
         """
 
-        chagre_info = self.charges[1:]
+        chagre_info = self.charges
         # if no data
-        if chagre_info.shape[0] is 0:
+        if chagre_info.shape[0] == 0:
             return None
 
         if style == 'matrix':
+            # charges on diagonal of each molecule
             charge_matrix = np.zeros(
-                (1, self.max_atom, self.max_atom), dtype=float)
-            data_num = self.get_data_shape().max()
-            for i in range(data_num):
-                charge_matrix_temp = np.zeros(
-                    (self.max_atom, self.max_atom), dtype=float)
-                np.fill_diagonal(charge_matrix_temp, chagre_info[i])
-                charge_matrix = np.append(
-                    charge_matrix, [charge_matrix_temp], axis=0)
+                (chagre_info.shape[0], self.max_atom, self.max_atom), dtype=float)
+            diag = np.arange(self.max_atom)
+            charge_matrix[:, diag, diag] = chagre_info
 
-            return charge_matrix[1:]
+            return charge_matrix
 
         elif style == 'array':
             return chagre_info
@@ -1620,41 +1980,64 @@ class Gdata():
         """
 
         # if no data
-        if self.structures.shape[0] is 1: 
+        if self.structures.shape[0] == 0:
             return None
 
         if coor_only is False:
-            return self.structures[1:]
+            return self.structures
         else:
-            return self.structures[1:, :, 1:]
+            return self.structures[:, :, 1:]
+
+    def to_interchange(self) -> dict:
+        """
+        Output all stored data without copy, for passing to other array libraries.
+        Numeric arrays support DLPack, e.g. torch.from_dlpack(data['structures'])
+        imports them zero-copy.
+
+        Args:
+            None
+        Returns:
+            data: contiguous arrays keyed by 'structures', 'charges', 'names',
+                  'topologies' and 'dipoles'. type <dict>
+        """
+        # stored data are views of the front of their buffers, already contiguous
+        return {'structures': np.ascontiguousarray(self.structures),
+                'charges': np.ascontiguousarray(self.charges),
+                'names': np.ascontiguousarray(self.names),
+                'topologies': np.ascontiguousarray(self.topologies),
+                'dipoles': np.ascontiguousarray(self.dipoles)}
 
     # load data from npy
     def load_all(self, directory: str):
         """
         A quick load method via defaul names. Should only read data that saved by method save_all()
+        Data are read from single archive gdata.npz, separate .npy files saved by older versions
+        are read if no archive found.
 
         Args:
             directory: a place to read data from. type <str>
         Returns:
             None
         """
-        # check '/'
-        name_len = len(directory)
+        # read from single archive
+        archive_name = os.path.join(directory, 'gdata.npz')
+        if os.path.exists(archive_name):
+            with np.load(archive_name) as archive:
+                self.__mount(archive['structure'],
+                             archive['charge'],
+                             archive['name'],
+                             archive['topology'],
+                             archive['dipole'],
+                             archive['config'])
+            return
 
-        if directory[name_len-1] != '/':
-            directory = directory + '/'
-        # check dir exist
-        try:
-            os.listdir(directory)
-        except:
-            os.mkdir(directory)
         # combine name
-        structure_name = directory + 'structure.npy'
-        charge_name = directory + 'charge.npy'
-        name_name = directory + 'name.npy'
-        topology_name = directory + 'topology.npy'
-        dipole_name = directory + 'dipole.npy'
-        config_name = directory + 'config.npy'
+        structure_name = os.path.join(directory, 'structure.npy')
+        charge_name = os.path.join(directory, 'charge.npy')
+        name_name = os.path.join(directory, 'name.npy')
+        topology_name = os.path.join(directory, 'topology.npy')
+        dipole_name = os.path.join(directory, 'dipole.npy')
+        config_name = os.path.join(directory, 'config.npy')
         
         self.load(
             structure_name, charge_name, name_name, topology_name, dipole_name, config_name)
@@ -1665,7 +2048,8 @@ class Gdata():
              name_name: str=None,
              topology_name: str=None,
              dipole_name: str=None,
-             config_name: str=None):
+             config_name: str=None,
+             mmap_mode: str=None):
         """
         Load saved structure, charge and name data from .npy file.
         Warning: this will erase all exist data in class. Create a new class and use merge to keep existing data.
@@ -1676,6 +2060,11 @@ class Gdata():
             name_name: path and name of saved name data. type <str>
             topology_name: path and name of saved topology data. type <str>
             dipole_name: path and name of saved dipole moment data. type <str>
+            config_name: path and name of saved config info. type <str>
+            mmap_mode: memory map large arrays instead of reading them into memory, passed to
+                       numpy.load, e.g. 'r' for read only or 'c' for copy-on-write. Mapped files stay
+                       open while the data are stored, on Windows they can not be overwritten by save().
+                       type <str>
         Returns:
             None
         """
@@ -1684,89 +2073,49 @@ class Gdata():
         names = None
         topologies = None
         dipoles = None
+        config = None
 
         if structure_name is not None:
-            structures = np.load(structure_name)
+            structures = np.load(structure_name, mmap_mode=mmap_mode)
         if charge_name is not None:
-            charges = np.load(charge_name)
+            charges = np.load(charge_name, mmap_mode=mmap_mode)
         if name_name is not None:
             names = np.load(name_name)
         if topology_name is not None:
-            topologies = np.load(topology_name)
+            topologies = np.load(topology_name, mmap_mode=mmap_mode)
         if dipole_name is not None:
-            dipoles = np.load(dipole_name)
+            dipoles = np.load(dipole_name, mmap_mode=mmap_mode)
         if config_name is not None:
             config = np.load(config_name)
-            # extract config info
-            # config info are stored as np.array [max_atom, charge_type, mi_coor], dtype=str
-            max_atom = int(config[0])
-            charge_type = config[1]
-            mi_coor = bool(config[2])
-        else:
-            print('Gdata: warining: no config file detected!')
-            max_atom = self.max_atom
 
-        # data check
-        if self.__data_check(structures, charges, names, topologies, dipoles) == True:
-            # get max_atom
-            self.max_atom = max_atom
-            # reinitialise value
-            self.structures = np.zeros((1, self.max_atom, 4), dtype=float)
-            self.charges = np.zeros((1, self.max_atom), dtype=float)
-            self.topologies = np.zeros(
-                (1, self.max_atom, self.max_atom), dtype=int)
-            self.names = np.zeros(1, dtype=str)
-            self.dipoles = np.zeros((1, 3), dtype=float)
-            # mount data to class
-            if structure_name is not None:
-                self.structures = np.append(
-                    self.structures, structures, axis=0)
-            if charge_name is not None:
-                self.charges = np.append(self.charges, charges, axis=0)
-            if name_name is not None:
-                self.names = np.append(self.names, names)
-            if topology_name is not None:
-                self.topologies = np.append(
-                    self.topologies, topologies, axis=0)
-            if dipole_name is not None:
-                self.dipoles = np.append(self.dipoles, dipoles, axis=0)
-            if config_name is not None:
-                self.charge_type = charge_type
-                self.mi_coor = mi_coor
-
-            print('Gdata:', self.get_data_shape().max(), 'data loaded and validated.',
-                      'Maximum allowed atom changed to', self.max_atom)
+        self.__mount(structures, charges, names, topologies, dipoles, config)
 
     # save data as npy
     def save_all(self, directory: str):
         """
         A quick save method via defaul names. Can use method load_all() to quickly read data
+        All data are saved in one compressed archive gdata.npz.
 
         Args:
             directory: a place to save data. type <str>
         Returns:
             None
         """
-        # check '/'
-        name_len = len(directory)
-
-        if directory[name_len-1] != '/':
-            directory = directory + '/'
-        # check dir exist
-        try:
-            os.listdir(directory)
-        except:
-            os.mkdir(directory)
+        # create dir if not exist
+        os.makedirs(directory, exist_ok=True)
         # combine name
-        structure_name = directory + 'structure.npy'
-        charge_name = directory + 'charge.npy'
-        name_name = directory + 'name.npy'
-        topology_name = directory + 'topology.npy'
-        dipole_name = directory + 'dipole.npy'
-        config_name = directory + 'config.npy'
-        
-        self.save(
-            structure_name, charge_name, name_name, topology_name, dipole_name, config_name)
+        archive_name = os.path.join(directory, 'gdata.npz')
+        #config info are stored as np.array [max_atom, charge_type, mi_coor], dtype=str
+        config = np.array((self.max_atom, self.charge_type, self.mi_coor), dtype=str)
+
+        np.savez_compressed(archive_name,
+                            structure=self.structures,
+                            charge=self.charges,
+                            name=self.names,
+                            topology=self.topologies,
+                            dipole=self.dipoles,
+                            config=config)
+        print('Gdata: Data saved as: ', archive_name)
 
     def save(self,
              structure_name: str=None,
@@ -1789,29 +2138,29 @@ class Gdata():
         """
         verbose_str = ''
         if structure_name is not None:
-            structures = self.structures[1:]
-            np.save(structure_name, structures)
+            structures = self.structures
+            self.__save_npy(structure_name, structures)
             verbose_str = verbose_str + ', ' + structure_name
         if charge_name is not None:
-            charges = self.charges[1:]
-            np.save(charge_name, charges)
+            charges = self.charges
+            self.__save_npy(charge_name, charges)
             verbose_str = verbose_str + ', ' + charge_name
         if name_name is not None:
-            names = self.names[1:]
-            np.save(name_name, names)
+            names = self.names
+            self.__save_npy(name_name, names)
             verbose_str = verbose_str + ', ' + name_name
         if topology_name is not None:
-            topologies = self.topologies[1:]
-            np.save(topology_name, topologies)
+            topologies = self.topologies
+            self.__save_npy(topology_name, topologies)
             verbose_str = verbose_str + ', ' + topology_name
         if dipole_name is not None:
-            dipoles = self.dipoles[1:]
-            np.save(dipole_name, dipoles)
+            dipoles = self.dipoles
+            self.__save_npy(dipole_name, dipoles)
             verbose_str = verbose_str + ', ' + dipole_name
         if config_name is not None:
             #config info are stored as np.array [max_atom, charge_type, mi_coor], dtype=str
             config = np.array((self.max_atom, self.charge_type, self.mi_coor), dtype=str)
-            np.save(config_name, config)
+            self.__save_npy(config_name, config)
             verbose_str = verbose_str + ', ' + config_name
 
         verbose_str = verbose_str[2:]
@@ -1819,16 +2168,17 @@ class Gdata():
 
     # read files in dir
 
-    def read_log_dir(self, dir_name: str, validation=True):
+    def read_log_dir(self, dir_name: str, validation=True, workers=None):
         """
         Read Gaussian log files from directory and store in self.structure, 
-        self.charges, self.name and self.dipoles
+        self.charges, self.name and self.dipoles, files are parsed in worker processes
 
         Args:
             dir_name: path and name of directory. type <str>
             validation: enable validation for log, this will check whether 
                         the Gaussian calculation exit normally in this log 
                         file. type <bool>
+            workers: number of worker processes, None for all cores, 1 for serial reading. type <int>
         Returns:
             None
         """
@@ -1838,48 +2188,56 @@ class Gdata():
         if dir_name[name_len-1] != '/':
             dir_name = dir_name + '/'
 
-        file_list = os.listdir(dir_name)
+        # directory entries carry file name and path
+        entries = self.__scan_dir(dir_name)
+        full_names = [entry.path for entry in entries]
 
-        file_num = len(file_list)
+        file_num = len(entries)
         fail_num = 0
+        # pre-allocate buffers for all files, filled by index
+        structures = np.zeros((file_num, self.max_atom, 4), dtype=np.float32)
+        charges = np.zeros((file_num, self.max_atom), dtype=np.float32)
+        dipoles = np.zeros((file_num, 3), dtype=np.float32)
+        names = []
+        k = 0   # write cursor
         print('Gdata: Start reading log data from', dir_name)
-        for file_name in tqdm(file_list):
-            full_name = dir_name + file_name    # conbine name
-
-            # skip wrong file
-            try:
-                file = open(full_name, 'r')
-            except:
-                print('Gdata: Fail to open file', full_name, 'Skipped!')
-                fail_num = fail_num + 1
-                continue
 
-            # validate file and skip bad file
-            if validation == True:
-                if self.__val_log(file) == False:
-                    print('Gdata: file', file_name,
+        args = (full_names, [self.charge_type] * file_num,
+                [self.max_atom] * file_num, [validation] * file_num)
+        executor = None
+        if workers == 1 or file_num < _MIN_PARALLEL_FILES:
+            results = map(read_log, *args)
+        else:
+            # imported on first use, not needed for starting up
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(read_log, *args, chunksize=16)
+        try:
+            for entry, (status, data) in tqdm(zip(entries, results), total=file_num):
+                # skip wrong file
+                if status == 'io':
+                    print('Gdata: Fail to open file', entry.path, 'Skipped!')
+                elif status == 'invalid':
+                    print('Gdata: file', entry.name,
                             'did not pass validation! Skipped!')
+                elif status == 'content':
+                    print('Gdata: Fail to read file', entry.path, 'Skipped!')
+                if status != 'ok':
                     fail_num = fail_num + 1
-                    file.close()
                     continue
-
-            try:
-                structure, charge, dipole = self.__read_log(file)
-            except:
-                print('Gdata: Fail to read file', full_name, 'Skipped!')
-                fail_num = fail_num + 1
-                continue
-            real_name = self.__find_real_name(file_name)
-            # append this structure to list
-            self.structures = np.append(
-                self.structures, [structure], axis=0)
-            # append this charge to list
-            self.charges = np.append(self.charges, [charge], axis=0)
-            # append this name to list
-            self.names = np.append(self.names, real_name)
-            # append this dipole to list
-            self.dipoles = np.append(self.dipoles, [dipole], axis=0)
-            file.close()
+                structures[k], charges[k], dipoles[k] = data
+                names.append(self.__find_real_name(entry.name))
+                k = k + 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if k != 0:
+            self.add_data(structures[:k],
+                          charges[:k],
+                          np.array(names),
+                          None,
+                          dipoles[:k])
 
         print('Gdata:', file_num - fail_num,
                 'log files read successfully!', fail_num, 'failed')
@@ -1899,28 +2257,22 @@ class Gdata():
         Returns:
             None
         """
-        # open file
-        file = open(file_name, 'r')
-        # validate file
-        if validation == True:
-            if self.__val_log(file) == False:
-                print('Gdata: file', file_name,
-                      'did not pass validation! Aborted!')
-                file.close()
-                raise
+        # open and map file, validation and reading share the same map
+        with open(file_name, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+            # validate file
+            if validation == True:
+                if val_log(log_map) == False:
+                    print('Gdata: file', file_name,
+                          'did not pass validation! Aborted!')
+                    raise
 
-        # read data from file
-        structure, charge, dipole = self.__read_log(file)
+            # read data from file
+            structure, charge, dipole = parse_log(
+                log_map, self.charge_type, self.max_atom)
         real_name = self.__find_real_name(file_name)
-        # append this structure to list
-        self.structures = np.append(self.structures, [structure], axis=0)
-        # append this charge to list
-        self.charges = np.append(self.charges, [charge], axis=0)
-        # append this name to list
-        self.names = np.append(self.names, real_name)
-        # append this dipole moment to list
-        self.dipoles = np.append(self.dipoles, [dipole], axis=0)
-        file.close()
+        # append structure, charge, name and dipole moment to stored data, grown in place
+        self.add_data(structure=structure, charge=charge, name=real_name, dipole=dipole)
 
 
         print('Gdata: log file successfully read:', file_name)
@@ -1949,17 +2301,8 @@ def gdata(max_atom=100,
     """
     gd = Gdata(max_atom=max_atom, charge_type=charge_type)
 
-    # data store
-    if type(structures) == np.ndarray:
-        gd.structures = np.append(gd.structures, structures, axis=0)
-    if type(charges) == np.ndarray:
-        gd.charges = np.append(gd.charges, charges, axis=0)
-    if type(names) == np.ndarray:
-        gd.names = np.append(gd.names, names)
-    if type(topologies) == np.ndarray:
-        gd.topologies = np.append(gd.topologies, topologies, axis=0)
-    if type(dipoles) == np.ndarray:
-        gd.dipoles = np.append(gd.dipoles, dipoles, axis=0)
+    # data store, each array is copied into class once
+    gd.add_data(structures, charges, names, topologies, dipoles)
 
     # data check
     gd.self_check()
@@ -2021,83 +2364,61 @@ def merge(Gdata_a: Gdata, Gdata_b: Gdata) -> Gdata:
     dipole2 = Gdata2.get_dipole(style='xyz')
     data_num_2 = Gdata2.get_data_shape().max()
 
+    # nothing to match in empty Gdata1, all data in Gdata2 are kept
+    if data_num_1 == 0:
+        Gdata_final.add_data(structure2, charge2, name2, topology2, dipole2)
+        return Gdata_final
+
+    # index names of Gdata2 once, repeated names are marked as -1
+    name_index = {}
+    if name2 is not None:
+        for loc2, name_temp in enumerate(name2.tolist()):
+            name_index[name_temp] = -1 if name_temp in name_index else loc2
+
     # compared name to merge
     print('Gdata: start merging data...')
-    for loc1 in tqdm(range(data_num_1)):
-        name_temp = name1[loc1]
-        loc2_array = np.where(name2 == name_temp)
+    # matched rows in Gdata2, in order of Gdata1
+    matched = []
+    for name_temp in name1.tolist():
+        # each name in Gdata2 can only be matched once
+        loc2 = name_index.pop(name_temp, -1)
 
         # finding same name in Gdata2
-        if loc2_array[0].ndim != 1:
-            print('Gdata: Dimension error!')
-            raise
-        if loc2_array[0].shape[0] is not 1:
+        if loc2 == -1:
             print('Gdata: more than one name matched or bad matching! Name:', name_temp)
             raise
-        else:
-
-            loc2 = loc2_array[0][0]
-
-            # structure
-            if np.min(np.array_equal(structure1[loc1], structure2[loc2])) == True:
-                strcture_temp = structure1[loc1]
-            elif np.count_nonzero(structure1[loc1]) * np.count_nonzero(structure2[loc2]) == 0:
-                strcture_temp = structure1[loc1] + structure2[loc2]
-            else:
-                print('Gdata: Conflict found between two sets of data.')
-                print('Gdata: Structure data conflict in %s' % (name1[loc1]))
-                print('Gdata: Data in first data set: \n', structure1[loc1], sep='')
-                print('Gdata: Data in Second data set: \n', structure2[loc2], sep='')
-                raise
-
-            # charge
-            if np.min(np.array_equal(charge1[loc1], charge2[loc2])) == True:
-                charge_temp = charge1[loc1]
-            elif np.count_nonzero(charge1[loc1]) * np.count_nonzero(charge2[loc2]) == 0:
-                charge_temp = charge1[loc1] + charge2[loc2]
-            else:
-                print('Gdata: Conflict found between two sets of data.')
-                print('Gdata: Charge data conflict in %s' % (name1[loc1]))
-                print('Gdata: Data in first data set: \n', charge1[loc1], sep='')
-                print('Gdata: Data in Second data set: \n', charge2[loc2], sep='')
-                raise
-
-            # topology
-            if np.min(np.array_equal(topology1[loc1], topology2[loc2])) == True:
-                topology_temp = topology1[loc1]
-            elif np.count_nonzero(topology1[loc1]) * np.count_nonzero(topology2[loc2]) == 0:
-                topology_temp = topology1[loc1] + topology2[loc2]
-            else:
-                print('Gdata: Conflict found between two sets of data.')
-                print('Gdata: Topology data conflict in %s' % (name1[loc1]))
-                print('Gdata: Data in first data set: \n', topology1[loc1], sep='')
-                print('Gdata: Data in Second data set: \n', topology2[loc2], sep='')
-                raise
-            
-            # dipole
-            if np.min(np.array_equal(dipole1[loc1], dipole2[loc2])) == True:
-                dipole_temp = dipole1[loc1]
-            elif np.count_nonzero(dipole1[loc1]) * np.count_nonzero(dipole2[loc2]) == 0:
-                dipole_temp = dipole1[loc1] + dipole2[loc2]
-            else:
-                print('Gdata: Conflict found between two sets of data.')
-                print('Gdata: Dipole moment data conflict in %s' % (name1[loc1]))
-                print('Gdata: Data in first data set: \n', dipole1[loc1], sep='')
-                print('Gdata: Data in Second data set: \n', dipole2[loc2], sep='')
-                raise
-
+        matched.append(loc2)
+    matched = np.array(matched, dtype=int)
+
+    def merge_data(data1: np.ndarray, data2: np.ndarray, data_name: str) -> np.ndarray:
+        # compare all matched rows at once
+        data2 = data2[matched]
+        row_axes = tuple(range(1, data1.ndim))
+        equal = (data1 == data2).all(axis=row_axes)
+        # rows with data in both sets must be equal, otherwise one of them is empty
+        conflict = ~equal & data1.any(axis=row_axes) & data2.any(axis=row_axes)
+        if conflict.any():
+            loc1 = np.nonzero(conflict)[0][0]
+            print('Gdata: Conflict found between two sets of data.')
+            print('Gdata: %s data conflict in %s' % (data_name, name1[loc1]))
+            print('Gdata: Data in first data set: \n', data1[loc1], sep='')
+            print('Gdata: Data in Second data set: \n', data2[loc1], sep='')
+            raise
+        # equal rows are kept, empty rows are filled by the other set
+        return np.where(equal.reshape((-1,) + (1,) * (data1.ndim - 1)),
+                        data1, data1 + data2)
 
-            # remove item in data2
-            structure2 = np.delete(structure2, loc2, axis=0)
-            charge2 = np.delete(charge2, loc2, axis=0)
-            name2 = np.delete(name2, loc2, axis=0)
-            topology2 = np.delete(topology2, loc2, axis=0)
-            dipole2 = np.delete(dipole2, loc2, axis=0)
-            # add in gdata_final
-            Gdata_final.add_data(strcture_temp, charge_temp,
-                                 name_temp, topology_temp, dipole_temp)
+    # add merged data in gdata_final
+    Gdata_final.add_data(merge_data(structure1, structure2, 'Structure'),
+                         merge_data(charge1, charge2, 'Charge'),
+                         name1,
+                         merge_data(topology1, topology2, 'Topology'),
+                         merge_data(dipole1, dipole2, 'Dipole moment'))
 
     # add rest data to gdata final
-    Gdata_final.add_data(structure2, charge2, name2, topology2, dipole2)
+    rest = np.ones(data_num_2, dtype=bool)
+    rest[matched] = False
+    Gdata_final.add_data(structure2[rest], charge2[rest], name2[rest],
+                         topology2[rest], dipole2[rest])
 
     return Gdata_final
@@ -1,25 +1,128 @@
 import gdata
 import os
 import platform
+import sys
 import numpy as np
 
 version = 'master'
 
+# user prompt in reverse video
+_PROMPT = '\033[7m %s \033[0m '
+
+# static parts of menus, joined once at import
+_MAIN_MENU_OPS = '\n'.join(['OPERATIONS:',
+                            '-1 \t - \t Refresh',
+                            '0 \t - \t Exit',
+                            '1 \t - \t New Gdata Class',
+                            '2 \t - \t Merge Gdata'])
+_GDATA_MENU_OPS = '\n'.join(['OPERATIONS:',
+                             '-1 \t - \t Refresh',
+                             '0 \t - \t Back',
+                             '1 \t - \t Delete Menu',
+                             '2 \t - \t Change Gdata Settings',
+                             '3 \t - \t Rename',
+                             '4 \t - \t Read Gaussian log',
+                             '5 \t - \t Read Gaussian zmat',
+                             '6 \t - \t Read mol File',
+                             '7 \t - \t Read mol2 File',
+                             '8 \t - \t Save Data as .npy',
+                             '9 \t - \t Laod .npy Data',
+                             '10 \t - \t Manage .xyz Structure Data',
+                             '11 \t - \t Convert to MI Based Coordinates'])
+_READ_MOL2_OPS = '\n'.join(['OPERATIONS:',
+                            '-1 \t - \t Refresh',
+                            '0 \t - \t Back',
+                            '1 \t - \t Read Single mol2 File',
+                            '2 \t - \t Read mol2 Files from Floder'])
+_READ_MOL_OPS = '\n'.join(['OPERATIONS:',
+                           '-1 \t - \t Refresh',
+                           '0 \t - \t Back',
+                           '1 \t - \t Read Single mol File',
+                           '2 \t - \t Read mol Files from Floder'])
+_DELETE_OPS = '\n'.join(['OPERATIONS:',
+                         '-1 \t - \t Refresh',
+                         '0 \t - \t Back',
+                         '1 \t - \t Delete this Class',
+                         '2 \t - \t Delete Structure Data',
+                         '3 \t - \t Delete Charge Data',
+                         '4 \t - \t Delete Topology Data',
+                         '5 \t - \t Delete Dipole Moment Data'])
+_MANAGE_XYZ_OPS = '\n'.join(['OPERATIONS:',
+                             '-1 \t - \t Refresh',
+                             '0 \t - \t Back',
+                             '1 \t - \t Read Single .xyz File',
+                             '2 \t - \t Read .xyz Files from Folder',
+                             '3 \t - \t Save Structure Data as .xyz file',
+                             '4 \t - \t Change Header Setting',
+                             'INFORMATION:',
+                             'Warning: xyz format only contains structure info'])
+_READ_LOG_OPS = '\n'.join(['OPERATIONS:',
+                           '-1 \t - \t Refresh',
+                           '0 \t - \t Back',
+                           '1 \t - \t From Single File',
+                           '2 \t - \t From Directory',
+                           '3 \t - \t Change Validation Setting',
+                           'INFORMATION:'])
+_READ_ZMAT_OPS = '\n'.join(['OPERATIONS:',
+                            '-1 \t - \t Refresh',
+                            '0 \t - \t Back',
+                            '1 \t - \t From Single File',
+                            '2 \t - \t From Directory'])
+_SETTINGS_OPS = '\n'.join(['OPERATIONS:',
+                           '-1 \t - \t Refresh',
+                           '0 \t - \t Back',
+                           '1 \t - \t Minimise Maximum Allowed Atom (Auto)',
+                           '2 \t - \t Change Maximum Allowed Atom (Manually)',
+                           '3 \t - \t Change Charge Type',
+                           'INFORMATION:'])
+_CHARGE_TYPE_OPS = '\n'.join(['Select Chagre Type:',
+                              '1 \t - \t Mulliken Charge',
+                              '2 \t - \t Hirshfeld Charge'])
+_GDATA_LIST_OPS = '\n'.join(['OPERATION:',
+                             '0 \t - \t Back',
+                             'AVALIABLE GDATA:'])
+
 def clear ():
     global clear_arg
-    os.system(clear_arg)
+    sys.stdout.write(clear_arg)
+    sys.stdout.flush()
+
+def clear_by_shell ():
+    # for consoles without escape sequence support
+    os.system('cls')
+
+def enable_vt_mode ():
+    # turn on escape sequence processing of Windows console, return True on success
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)     # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)) == 0:
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return kernel32.SetConsoleMode(handle, mode.value | 0x0004) != 0
+    except Exception:
+        return False
 
 def input_command (cmd:str='User Command:', numeric_check=True):
-    ucommand = input('\033[7m %s \033[0m ' % (cmd))
+    ucommand = input(_PROMPT % (cmd))
     if numeric_check == True:
-        try: 
-            ucommand = int(ucommand)
-            return ucommand
-        except Exception as e:
-            return None
+        # check digits directly, no exception is raised by text input
+        digits = ucommand.strip()
+        if digits[:1] in ('-', '+'):
+            digits = digits[1:]
+        if digits.isdecimal():
+            return int(ucommand)
+        return None
     return ucommand
 
 
+def render (lines:list):
+    # whole screen is written at once
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
 def print_welcome ():
     global pltf
     global version
@@ -40,67 +143,47 @@ def main_menu ():
         print_welcome()
 
     # title
-    print('--- MAIN MENU ---')
-
-    list_num = -1
-    print('OPERATIONS:')
-    print('%d \t - \t Refresh' % (list_num))
-    list_num += 1
-    print('%d \t - \t Exit' % (list_num))
-    list_num += 1
-    print('%d \t - \t New Gdata Class' % (list_num))    # append gd function
-    list_num += 1
-    print('%d \t - \t Merge Gdata' % (list_num))
-    list_num += 1
+    lines = ['--- MAIN MENU ---', _MAIN_MENU_OPS]
+
+    # operations take numbers -1 to 2
+    list_num = 3
     gd_list_start = list_num
-    print('DATA:')  # list gd data
-    for i in range(len(gdata_list)):
-        print('%d \t - \t Gdata %s' % (list_num, gdata_name[i]))
+    lines.append('DATA:')  # list gd data
+    for name in gdata_name:
+        lines.append('%d \t - \t Gdata %s' % (list_num, name))
         list_num += 1
-    
+    render(lines)
+
     return gd_list_start, list_num
 
 def gdata_menu_title (selected_data: int):
     global gdata_name
     global gdata_list
+    gd = gdata_list[selected_data]
     clear()
-    print('--- Gdata Menu %s ---' % (gdata_name[selected_data]))
-
     # functions
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Delete Menu')
-    print('2 \t - \t Change Gdata Settings')
-    print('3 \t - \t Rename')
-    print('4 \t - \t Read Gaussian log')
-    print('5 \t - \t Read Gaussian zmat')
-    print('6 \t - \t Read mol File')
-    print('7 \t - \t Read mol2 File')
-    print('8 \t - \t Save Data as .npy')
-    print('9 \t - \t Laod .npy Data')
-    print('10 \t - \t Manage .xyz Structure Data')
-    print('11 \t - \t Convert to MI Based Coordinates')
+    lines = ['--- Gdata Menu %s ---' % (gdata_name[selected_data]), _GDATA_MENU_OPS]
 
     # information
-    print('INFORMATION:')
-    print('Maximum allowed atom: \t %d' % (gdata_list[selected_data].max_atom))
-    print('Number of data: \t %d' % (gdata_list[selected_data].get_data_shape()[0]))
-    print('Charge type: \t \t %s' % (gdata_list[selected_data].charge_type))
+    lines.append('INFORMATION:')
+    lines.append('Maximum allowed atom: \t %d' % (gd.max_atom))
+    lines.append('Number of data: \t %d' % (gd.get_data_shape()[0]))
+    lines.append('Charge type: \t \t %s' % (gd.charge_type))
     mi_coor = 'N'
-    if gdata_list[selected_data].mi_coor is True:
+    if gd.mi_coor is True:
         mi_coor = 'Y'
-    print('Mi coordinates: \t %c' % (mi_coor))
+    lines.append('Mi coordinates: \t %c' % (mi_coor))
 
-    print('')
+    lines.append('')
     structures_exist, charges_exist, names_exist, topologies_exist, dipoles_exist = data_exist_check(selected_data)
     
-    print('DATA EXISTANCE:')
-    print('XYZ Struacture: \t %c' % (structures_exist))
-    print('Charge Data: \t \t %c' % (charges_exist))
-    print('Name Data: \t \t %c' % (names_exist))
-    print('Topology Info: \t \t %c' % (topologies_exist))
-    print('Dipole Moment: \t \t %c' % (dipoles_exist))
+    lines.append('DATA EXISTANCE:')
+    lines.append('XYZ Struacture: \t %c' % (structures_exist))
+    lines.append('Charge Data: \t \t %c' % (charges_exist))
+    lines.append('Name Data: \t \t %c' % (names_exist))
+    lines.append('Topology Info: \t \t %c' % (topologies_exist))
+    lines.append('Dipole Moment: \t \t %c' % (dipoles_exist))
+    render(lines)
 
 
 def gdata_menu (selected_data: int):
@@ -204,12 +287,7 @@ def read_mol2_title (selected_data):
     global gdata_name
 
     clear()
-    print('Read mol2 file to %s' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Read Single mol2 File')
-    print('2 \t - \t Read mol2 Files from Floder')
+    render(['Read mol2 file to %s' % (gdata_name[selected_data]), _READ_MOL2_OPS])
 
 def read_mol (selected_data:int):
     global gdata_list
@@ -248,12 +326,7 @@ def read_mol_title (selected_data:int):
     global gdata_name
 
     clear()
-    print('Read mol file to %s' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Read Single mol File')
-    print('2 \t - \t Read mol Files from Floder')
+    render(['Read mol file to %s' % (gdata_name[selected_data]), _READ_MOL_OPS])
 
 def gdata_delete (selected_data:int):
     global gdata_list
@@ -310,46 +383,25 @@ def gdata_delete (selected_data:int):
 def gdata_delete_title (selected_data:int):
     global gdata_name
     clear()
-    print('--- Delete Data in %s ---' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Delete this Class')
-    print('2 \t - \t Delete Structure Data')
-    print('3 \t - \t Delete Charge Data')
-    print('4 \t - \t Delete Topology Data')
-    print('5 \t - \t Delete Dipole Moment Data')
+    lines = ['--- Delete Data in %s ---' % (gdata_name[selected_data]), _DELETE_OPS]
 
     structures_exist, charges_exist, names_exist, topologies_exist, dipoles_exist = data_exist_check(selected_data)
-    print('DATA EXISTANCE:')
-    print('XYZ Struacture: \t %c' % (structures_exist))
-    print('Charge Data: \t \t %c' % (charges_exist))
-    print('Name Data: \t \t %c' % (names_exist))
-    print('Topology Info: \t \t %c' % (topologies_exist))
-    print('Dipole Moment: \t \t %c' % (dipoles_exist))
+    lines.append('DATA EXISTANCE:')
+    lines.append('XYZ Struacture: \t %c' % (structures_exist))
+    lines.append('Charge Data: \t \t %c' % (charges_exist))
+    lines.append('Name Data: \t \t %c' % (names_exist))
+    lines.append('Topology Info: \t \t %c' % (topologies_exist))
+    lines.append('Dipole Moment: \t \t %c' % (dipoles_exist))
+    render(lines)
 
 def data_exist_check (selected_data:int):
     global gdata_list
 
     # Data Exist Check
-    structures_exist = 'N'
-    charges_exist = 'N'
-    names_exist = 'N'
-    topologies_exist = 'N'
-    dipoles_exist = 'N'
-
-    if np.count_nonzero(gdata_list[selected_data].structures) > 0:
-        structures_exist = 'Y'
-    if np.count_nonzero(gdata_list[selected_data].charges) > 0:
-        charges_exist = 'Y'
-    if gdata_list[selected_data].names.shape[0] > 1:
-        names_exist = 'Y'
-    if np.count_nonzero(gdata_list[selected_data].topologies) > 0:
-        topologies_exist = 'Y'
-    if np.count_nonzero(gdata_list[selected_data].dipoles) > 0:
-        dipoles_exist = 'Y'
-
-    return structures_exist, charges_exist, names_exist, topologies_exist, dipoles_exist
+    # in order of structures, charges, names, topologies and dipoles
+    flags = gdata_list[selected_data].existence_flags()
+
+    return tuple('Y' if flag else 'N' for flag in flags)
 
 def manage_xyz (selected_data:int):
     global gdata_list
@@ -400,34 +452,24 @@ def manage_xyz_title (selected_data:int, header:bool):
     global gdata_list
     global gdata_name
     clear()
-    print('--- Manage XYZ in %s ---' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Read Single .xyz File')
-    print('2 \t - \t Read .xyz Files from Folder')
-    print('3 \t - \t Save Structure Data as .xyz file')
-    print('4 \t - \t Change Header Setting')
-    print('INFORMATION:')
-    print('Warning: xyz format only contains structure info')
-    print('Header Setting: \t %s' % (header))
+    render(['--- Manage XYZ in %s ---' % (gdata_name[selected_data]),
+            _MANAGE_XYZ_OPS,
+            'Header Setting: \t %s' % (header)])
 
 
 def cat_data (selected_data:int):
     global gdata_list
     global gdata_name
-
-    print('--- DEV MODE CAT (%s) ---' % (gdata_name[selected_data]))
-    print('Structure:')
-    print(gdata_list[selected_data].structures[1:])
-    print('Charge:')
-    print(gdata_list[selected_data].charges[1:])
-    print('name:')
-    print(gdata_list[selected_data].names[1:])
-    print('topology:')
-    print(gdata_list[selected_data].topologies[1:])
-    print('dipole:')
-    print(gdata_list[selected_data].dipoles[1:])
+    gd = gdata_list[selected_data]
+
+    # large arrays are always summarised, whatever global print options are set
+    with np.printoptions(threshold=64, edgeitems=3, linewidth=120, precision=4, suppress=True):
+        render(['--- DEV MODE CAT (%s) ---' % (gdata_name[selected_data]),
+                'Structure:', str(gd.structures),
+                'Charge:', str(gd.charges),
+                'name:', str(gd.names),
+                'topology:', str(gd.topologies),
+                'dipole:', str(gd.dipoles)])
     input_command('Press Enter to Continue', numeric_check=False)
 
 def new_gdata ():
@@ -443,15 +485,9 @@ def new_gdata ():
 def read_log_title (selected_data: int, validation_check):
     global gdata_name
     clear()
-    print('Read Gaussian Log to %s:' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t From Single File')
-    print('2 \t - \t From Directory')
-    print('3 \t - \t Change Validation Setting')
-    print('INFORMATION:')
-    print('Validation Check: \t %s' % (validation_check))
+    render(['Read Gaussian Log to %s:' % (gdata_name[selected_data]),
+            _READ_LOG_OPS,
+            'Validation Check: \t %s' % (validation_check)])
 
 def read_log (selected_data:int):
     global gdata_list
@@ -497,12 +533,7 @@ def read_log (selected_data:int):
 def read_zmat_title (selected_data:int):
     global gdata_name
     clear()
-    print('Read Gaussian Zmat to %s:' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t From Single File')
-    print('2 \t - \t From Directory')
+    render(['Read Gaussian Zmat to %s:' % (gdata_name[selected_data]), _READ_ZMAT_OPS])
 
 def read_zmat (selected_data:int):
     global gdata_list
@@ -557,9 +588,7 @@ def change_settings (selected_data:int):
                 print('Invalid Input!')
         elif ucommand == 3:     # change charge type
             clear()
-            print('Select Chagre Type:')
-            print('1 \t - \t Mulliken Charge')
-            print('2 \t - \t Hirshfeld Charge')
+            render([_CHARGE_TYPE_OPS])
             ucommand = input_command()
             if ucommand == 1:
                 gdata_list[selected_data].charge_type = 'Mulliken'
@@ -574,47 +603,46 @@ def change_settings (selected_data:int):
 def change_settings_title (selected_data:int):
     global gdata_name
     global gdata_list
+    gd = gdata_list[selected_data]
     clear()
-    print('Change Gdata %s Settings:' % (gdata_name[selected_data]))
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Minimise Maximum Allowed Atom (Auto)')
-    print('2 \t - \t Change Maximum Allowed Atom (Manually)')
-    print('3 \t - \t Change Charge Type')
-    print('INFORMATION:')
-    print('Maximum Allowed Atom: \t %d' % (gdata_list[selected_data].max_atom))
-    print('Number of Data: \t %d' % (gdata_list[selected_data].get_data_shape()[0]))
-    print('Charge Type: \t \t %s' % (gdata_list[selected_data].charge_type))
+    render(['Change Gdata %s Settings:' % (gdata_name[selected_data]),
+            _SETTINGS_OPS,
+            'Maximum Allowed Atom: \t %d' % (gd.max_atom),
+            'Number of Data: \t %d' % (gd.get_data_shape()[0]),
+            'Charge Type: \t \t %s' % (gd.charge_type)])
 
 def data_save_load (selected_data:int, operation:str):
     directory = input_command('Path:', numeric_check=False)
-    # check '/'
-    name_len = len(directory)
-    if name_len == 0:
+    if len(directory) == 0:
         print('Invalid Input!')
         input_command('Press Enter to Continue', numeric_check=False)
         return -1
-    if directory[name_len-1] != '/':
-        directory = directory + '/'
-    # check dir exist
-    try:
-        os.listdir(directory)
-    except:
-        os.mkdir(directory)
-    # combine name
-    structure_name = directory + 'structure.npy'
-    charge_name = directory + 'charge.npy'
-    name_name = directory + 'name.npy'
-    topology_name = directory + 'topology.npy'
-    dipole_name = directory + 'dipole.npy'
-    config_name = directory + 'config.npy'
+    # create dir if not exist, only needed for saving
     if operation == 'save':
-        gdata_list[selected_data].save(
-            structure_name, charge_name, name_name, topology_name, dipole_name, config_name)
-    elif operation == 'load':
-        gdata_list[selected_data].load(
-            structure_name, charge_name, name_name, topology_name, dipole_name, config_name)
+        os.makedirs(directory, exist_ok=True)
+    # combine name
+    structure_name = os.path.join(directory, 'structure.npy')
+    charge_name = os.path.join(directory, 'charge.npy')
+    name_name = os.path.join(directory, 'name.npy')
+    topology_name = os.path.join(directory, 'topology.npy')
+    dipole_name = os.path.join(directory, 'dipole.npy')
+    config_name = os.path.join(directory, 'config.npy')
+    try:
+        if operation == 'save':
+            gdata_list[selected_data].save(
+                structure_name, charge_name, name_name, topology_name, dipole_name, config_name)
+        elif operation == 'load':
+            # mapped files are copy-on-write, pages are read when used and files are never modified
+            # mapped files stay open while loaded, on Windows they can not be saved over
+            print('Map files instead of reading them into memory?')
+            print('Warning: on Windows, mapped files can not be overwritten by saving to the same folder.')
+            mmap = input_command('Map Files (y/n):', numeric_check=False)
+            mmap_mode = 'c' if mmap.strip().lower() == 'y' else None
+            gdata_list[selected_data].load(
+                structure_name, charge_name, name_name, topology_name, dipole_name, config_name,
+                mmap_mode=mmap_mode)
+    except Exception as e:
+        print(e)
     input_command('Press Enter to Continue', numeric_check=False)
 
 def merge () :
@@ -633,18 +661,20 @@ def merge () :
             return 0
         elif ucommand == 1:
             merge_gdata_list()
-            data_temp = input_command('Select Gdata:') - 1
-            if data_temp in range(len(gdata_name)):
-                data_1 = data_temp
+            data_temp = input_command('Select Gdata:')
+            # listed from 1, non-numeric input is None
+            if data_temp is not None and 1 <= data_temp <= len(gdata_name):
+                data_1 = data_temp - 1
             else:
                 print('Invalid Input!')
                 input_command('Press Enter to Continue', numeric_check=False)
             merge_title(data_1, data_2)
         elif ucommand == 2:
             merge_gdata_list()
-            data_temp = input_command('Select Gdata:') - 1
-            if data_temp in range(len(gdata_name)):
-                data_2 = data_temp
+            data_temp = input_command('Select Gdata:')
+            # listed from 1, non-numeric input is None
+            if data_temp is not None and 1 <= data_temp <= len(gdata_name):
+                data_2 = data_temp - 1
             else:
                 print('Invalid Input!')
                 input_command('Press Enter to Continue', numeric_check=False)
@@ -677,33 +707,29 @@ def merge_title (data_1, data_2):
         data_2_name = 'None'
     else:
         data_2_name = gdata_name[data_2]
-    print('--- Merge menu ---')
-    print('OPERATIONS:')
-    print('-1 \t - \t Refresh')
-    print('0 \t - \t Back')
-    print('1 \t - \t Selected First Gdata: %s' % (data_1_name))
-    print('2 \t - \t Selected Second Gdata: %s' % (data_2_name))
-    print('3 \t - \t Merge Confirm')
+    render(['--- Merge menu ---',
+            'OPERATIONS:',
+            '-1 \t - \t Refresh',
+            '0 \t - \t Back',
+            '1 \t - \t Selected First Gdata: %s' % (data_1_name),
+            '2 \t - \t Selected Second Gdata: %s' % (data_2_name),
+            '3 \t - \t Merge Confirm'])
 
 def merge_gdata_list ():
     global gdata_name
     clear()
-    print('OPERATION:')
-    print('0 \t - \t Back')
-    print('AVALIABLE GDATA:')
-    list_num = 1
-    for i in range (len(gdata_name)):
-        print('%d \t - \t %s' % (list_num, gdata_name[i]))
-        list_num += 1
+    lines = [_GDATA_LIST_OPS]
+    for list_num, name in enumerate(gdata_name, start=1):
+        lines.append('%d \t - \t %s' % (list_num, name))
+    render(lines)
 
 if __name__ == '__main__':
     pltf = platform.system()
-    if pltf == 'Windows':
-        clear_arg = 'cls'
-    elif pltf == 'Linux':
-        clear_arg = 'clear'
-    else:
-        clear_arg = 'clear'
+    # clear screen and move cursor home by ANSI escape sequence, no shell is started
+    clear_arg = '\033[2J\033[H'
+    if pltf == 'Windows' and enable_vt_mode() == False:
+        # console cannot handle escape sequence, clear by shell instead
+        clear = clear_by_shell
     
     clear()
     print('Initialising...')
@@ -737,7 +763,7 @@ if __name__ == '__main__':
         elif ucommand == 2:     # merge
             merge()
             gd_list_start, list_num = main_menu()
-        elif ucommand in range(gd_list_start, list_num):
+        elif ucommand is not None and gd_list_start <= ucommand < list_num:
             selected_data = ucommand - 3
             gdata_menu(selected_data)
             selected_data = 0